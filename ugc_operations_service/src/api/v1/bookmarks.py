@@ -1,9 +1,11 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic_mongo import ObjectIdField
 
-from src.schemas.base import BaseDelete
+from src.core.config import app_settings
+from src.schemas.base import BaseDelete, Page
 from src.schemas.bookmark import Bookmark
 from src.schemas.bookmark import BookmarkCreate
 from src.services.bookmark import BookmarkService, get_bookmark_service
@@ -21,14 +23,21 @@ async def create_bookmark(
     return new_bookmark
 
 
-@router.get("/{user_id}", response_model=list[Bookmark], status_code=status.HTTP_200_OK)
+@router.get("/{user_id}", response_model=Page[Bookmark], status_code=status.HTTP_200_OK)
 async def user_bookmarks(
     user_id: UUID,
     bookmark_service: BookmarkService = Depends(get_bookmark_service),
-) -> list[Bookmark]:
-    """Returns all user's bookmarks."""
-    bookmarks = await bookmark_service.get_bookmarks_by_user_id(user_id)
-    return bookmarks
+    limit: int = Query(
+        app_settings.pagination_size, ge=1, le=app_settings.max_pagination_size
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    fields: list[str] | None = Query(None, description="Fields to return"),
+) -> StreamingResponse:
+    """Returns a page of user's bookmarks, newest first."""
+    bookmarks = await bookmark_service.get_bookmarks_by_user_id(
+        user_id, limit, cursor, fields
+    )
+    return StreamingResponse(bookmarks, media_type="application/json")
 
 
 @router.delete(
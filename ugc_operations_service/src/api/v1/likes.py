@@ -1,10 +1,12 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic_mongo import ObjectIdField
 
-from src.schemas.base import BaseDelete
-from src.schemas.like import Like as Like, LikeCreate
+from src.core.config import app_settings
+from src.schemas.base import BaseDelete, Page
+from src.schemas.like import Like as Like, LikeCreate, LikeSort
 from src.services.like import LikeService, get_like_service
 
 router = APIRouter()
@@ -41,12 +43,19 @@ async def delete_like(
     return deleted_like
 
 
-@router.get("/{movie_id}", response_model=list[Like], status_code=status.HTTP_200_OK)
+@router.get("/{movie_id}", response_model=Page[Like], status_code=status.HTTP_200_OK)
 async def movie_likes(
     movie_id: UUID,
     like_service: LikeService = Depends(get_like_service),
-    sort: str = "date",
-) -> list[Like]:
-    """Returns all likes for a movie."""
-    likes = await like_service.get_likes_by_movie_id(movie_id, sort)
-    return likes
+    sort: LikeSort = LikeSort.DATE,
+    limit: int = Query(
+        app_settings.pagination_size, ge=1, le=app_settings.max_pagination_size
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    fields: list[str] | None = Query(None, description="Fields to return"),
+) -> StreamingResponse:
+    """Returns a page of likes for a movie in the sort order."""
+    likes = await like_service.get_likes_by_movie_id(
+        movie_id, sort, limit, cursor, fields
+    )
+    return StreamingResponse(likes, media_type="application/json")
@@ -1,10 +1,13 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic_mongo import ObjectIdField
 
-from src.schemas.base import BaseDelete
-from src.schemas.review import Review, ReviewCreate
+from src.core.config import app_settings
+from src.core.messages import REVIEW_NOT_FOUND
+from src.schemas.base import BaseDelete, Page
+from src.schemas.review import Review, ReviewCreate, ReviewSort
 from src.services.review import ReviewService, get_review_service
 
 router = APIRouter()
@@ -20,15 +23,22 @@ async def create_review(
     return new_review
 
 
-@router.get("/{movie_id}", response_model=list[Review], status_code=status.HTTP_200_OK)
+@router.get("/{movie_id}", response_model=Page[Review], status_code=status.HTTP_200_OK)
 async def movie_reviews(
     movie_id: UUID,
     review_service: ReviewService = Depends(get_review_service),
-    sort: str = "date",
-) -> list[Review]:
-    """Returns all reviews for a movie."""
-    reviews = await review_service.get_reviews_by_movie_id(movie_id, sort)
-    return reviews
+    sort: ReviewSort = ReviewSort.DATE,
+    limit: int = Query(
+        app_settings.pagination_size, ge=1, le=app_settings.max_pagination_size
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    fields: list[str] | None = Query(None, description="Fields to return"),
+) -> StreamingResponse:
+    """Returns a page of reviews for a movie in the sort order."""
+    reviews = await review_service.get_reviews_by_movie_id(
+        movie_id, sort, limit, cursor, fields
+    )
+    return StreamingResponse(reviews, media_type="application/json")
 
 
 @router.post(
@@ -36,11 +46,15 @@ async def movie_reviews(
 )
 async def like_review(
     review_id: ObjectIdField,
+    request: Request,
     review_service: ReviewService = Depends(get_review_service),
 ) -> Review:
-    """Add a like to a review."""
-
-    liked_review = await review_service.like_review(review_id)
+    """Add a like of the user to a review, a repeated like is counted once."""
+    liked_review = await review_service.like_review(review_id, request.user_jwt)
+    if not liked_review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=REVIEW_NOT_FOUND
+        )
     return liked_review
 
 
@@ -49,10 +63,15 @@ async def like_review(
 )
 async def dislike_review(
     review_id: ObjectIdField,
+    request: Request,
     review_service: ReviewService = Depends(get_review_service),
 ) -> Review:
-    """Add a dislike to a review."""
-    disliked_review = await review_service.dislike_review(review_id)
+    """Add a dislike of the user to a review, a repeated dislike is counted once."""
+    disliked_review = await review_service.dislike_review(review_id, request.user_jwt)
+    if not disliked_review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=REVIEW_NOT_FOUND
+        )
     return disliked_review
 
 
@@ -22,6 +22,7 @@ class AppSettings(BaseConfig):
     log_level: str = "INFO"
     project_name: str = "UGC Operations Service"
     pagination_size: int = 100
+    max_pagination_size: int = 1000
     authjwt_secret_key: str = "secretsecret"
 
     class Config:
@@ -53,6 +54,10 @@ class MongoSettings(BaseConfig):
     user: str = "app"
     password: str = "pass"
 
+    max_pool_size: int = 100
+    min_pool_size: int = 10
+    max_idle_time_ms: int | None = 60000
+
     class Config:
         env_prefix = "mongo_"
         extra = "allow"
@@ -1 +1,3 @@
 NOT_AUTHENTICATED = "Not authenticated"
+REVIEW_NOT_FOUND = "Review not found"
+DUPLICATE_KEY = "The user already has a like, review or bookmark for this movie"
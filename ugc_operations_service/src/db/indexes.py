@@ -0,0 +1,74 @@
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from src.core.config import mongo_settings
+
+logger = logging.getLogger(__name__)
+
+
+def sort_index(key: str, sort_field: str) -> IndexModel:
+    """Index serving the listings by `key` in descending (sort_field, _id) order."""
+    keys = [(key, ASCENDING), (sort_field, DESCENDING)]
+    if sort_field != "_id":
+        keys.append(("_id", DESCENDING))
+    return IndexModel(keys, name=f"{key}_{sort_field.strip('_')}")
+
+
+def unique_index(*keys: str) -> IndexModel:
+    """Index allowing one document per combination of the keys."""
+    return IndexModel(
+        [(key, ASCENDING) for key in keys], name="_".join(keys), unique=True
+    )
+
+
+# One like, review and bookmark per user and movie, and one vote per user and
+# review. The unique index also serves the lookups by user_id, and the sort
+# indexes the lookups by movie_id.
+INDEXES: dict[str, list[IndexModel]] = {
+    "likes": [
+        unique_index("user_id", "movie_id"),
+        sort_index("movie_id", "_id"),
+        sort_index("movie_id", "score"),
+    ],
+    "reviews": [
+        unique_index("user_id", "movie_id"),
+        sort_index("movie_id", "date_published"),
+        sort_index("movie_id", "likes"),
+        sort_index("movie_id", "dislikes"),
+        sort_index("movie_id", "movie_score"),
+    ],
+    "bookmarks": [
+        unique_index("user_id", "movie_id"),
+        sort_index("user_id", "_id"),
+        IndexModel([("movie_id", ASCENDING)], name="movie_id"),
+    ],
+    "review_votes": [unique_index("review_id", "user_id")],
+}
+
+
+async def create_indexes(client: AsyncIOMotorClient) -> None:
+    """
+    Create the indexes of the collections, existing ones are left as they are.
+
+    A unique index that cannot be built, e.g. over duplicates written before it
+    existed, fails the startup: without it the upserts could create duplicates
+    again. The duplicates must be merged or removed first. Other indexes only
+    serve the queries, so one that cannot be built is logged and skipped.
+    """
+    db = client[mongo_settings.db]
+    for collection_name, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection_name].create_indexes([index])
+            except OperationFailure as e:
+                if index.document.get("unique"):
+                    raise
+                logger.error(
+                    "Index %s of %s is not created: %s",
+                    index.document["name"],
+                    collection_name,
+                    e,
+                )
@@ -2,15 +2,25 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 from src.core.config import mongo_settings
 
+mongo_client: AsyncIOMotorClient | None = None
 
-def get_mongo_client() -> AsyncIOMotorClient:
-    """Get the Mongo client instance."""
-    mongo_client = AsyncIOMotorClient(
+
+def create_mongo_client() -> AsyncIOMotorClient:
+    """Create a Mongo client with its own connection pool."""
+    client = AsyncIOMotorClient(
         host=mongo_settings.host,
         port=mongo_settings.port,
         username=mongo_settings.user,
         password=mongo_settings.password,
         uuidRepresentation="standard",
+        maxPoolSize=mongo_settings.max_pool_size,
+        minPoolSize=mongo_settings.min_pool_size,
+        maxIdleTimeMS=mongo_settings.max_idle_time_ms,
     )
-    mongo_client.db_name = mongo_settings.db
+    client.db_name = mongo_settings.db
+    return client
+
+
+async def get_mongo_client() -> AsyncIOMotorClient:
+    """Get the Mongo client instance shared by the application."""
     return mongo_client
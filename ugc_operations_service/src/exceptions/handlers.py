@@ -1,9 +1,13 @@
 from async_fastapi_jwt_auth.exceptions import AuthJWTException
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 from starlette import status
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from src.core.messages import DUPLICATE_KEY
+from src.exceptions.pagination import PaginationError
+
 
 def authjwt_exception_handler(request: Request, exc: AuthJWTException):
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
@@ -13,3 +17,15 @@ async def validation_error_handler(request: Request, exc: ValidationError):
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST, content={"errors": exc.errors()}
     )
+
+
+async def pagination_error_handler(request: Request, exc: PaginationError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)}
+    )
+
+
+async def duplicate_key_error_handler(request: Request, exc: DuplicateKeyError):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT, content={"detail": DUPLICATE_KEY}
+    )
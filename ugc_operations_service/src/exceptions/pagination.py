@@ -0,0 +1,2 @@
+class PaginationError(ValueError):
+    """Raised when a page is requested with an invalid cursor or fields."""
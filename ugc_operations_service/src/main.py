@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 import sentry_sdk
 import uvicorn
@@ -13,13 +14,22 @@ from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 from starlette import status
 from starlette.requests import Request
 
 from src.api.v1 import bookmarks, reviews, likes
 from src.core.config import app_settings, jaeger_settings, sentry_settings
 from src.core.logger import LOGGING
-from src.exceptions.handlers import authjwt_exception_handler, validation_error_handler
+from src.db import mongo
+from src.db.indexes import create_indexes
+from src.exceptions.handlers import (
+    authjwt_exception_handler,
+    duplicate_key_error_handler,
+    pagination_error_handler,
+    validation_error_handler,
+)
+from src.exceptions.pagination import PaginationError
 from src.middleware.jwt import set_current_user
 
 
@@ -57,12 +67,21 @@ if sentry_settings.enable_sdk:
     )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    mongo.mongo_client = mongo.create_mongo_client()
+    await create_indexes(mongo.mongo_client)
+    yield
+    mongo.mongo_client.close()
+
+
 app = FastAPI(
     title=app_settings.project_name,
     description="A service that provides methods for generating content by users.",
     docs_url="/api/openapi",
     openapi_url="/api/openapi.json",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 FastAPIInstrumentor.instrument_app(app)
@@ -103,6 +122,8 @@ app.include_router(
 
 app.exception_handler(AuthJWTException)(authjwt_exception_handler)
 app.exception_handler(ValidationError)(validation_error_handler)
+app.exception_handler(PaginationError)(pagination_error_handler)
+app.exception_handler(DuplicateKeyError)(duplicate_key_error_handler)
 
 if __name__ == "__main__":
     uvicorn.run(
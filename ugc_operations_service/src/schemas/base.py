@@ -1,6 +1,10 @@
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, Field
 from pydantic_mongo import ObjectIdField
 
+M = TypeVar("M")
+
 
 class ObjectIDMixin(BaseModel):
     """Mixin for models with an ObjectIdField."""
@@ -20,3 +24,10 @@ class BaseUpdate(ObjectIDMixin, AcknowledgedMixin):
 
 class BaseDelete(ObjectIDMixin, AcknowledgedMixin):
     deleted_count: int
+
+
+class Page(BaseModel, Generic[M]):
+    """A page of a listing and the cursor of the next one, null on the last page."""
+
+    items: list[M]
+    next_cursor: str | None = None
@@ -1,3 +1,4 @@
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
@@ -20,3 +21,8 @@ class LikeCreate(BaseModel):
 class Like(ObjectIDMixin, LikeCreate):
     model_config = ConfigDict(extra="allow")
     pass
+
+
+class LikeSort(str, Enum):
+    DATE = "date"
+    SCORE = "score"
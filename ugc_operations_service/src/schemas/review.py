@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -19,3 +20,10 @@ class ReviewCreate(BaseModel):
 class Review(ObjectIDMixin, ReviewCreate):
     model_config = ConfigDict(extra="allow")
     pass
+
+
+class ReviewSort(str, Enum):
+    DATE = "date"
+    LIKES = "likes"
+    DISLIKES = "dislikes"
+    MOVIE_SCORE = "movie_score"
@@ -1,10 +1,15 @@
-from typing import Type
+from typing import AsyncIterator, Callable, Type, get_args
 
+from bson import ObjectId
+
+from motor.motor_asyncio import AsyncIOMotorCursor
 from pydantic import BaseModel
 from pydantic_mongo import ObjectIdField
 
+from src.exceptions.pagination import PaginationError
 from src.schemas.base import BaseDelete
 from src.services.data_repository.mongo import MongoService
+from src.services.pagination import decode_cursor, stream_page
 
 
 class BaseService[M: BaseModel]:
@@ -47,3 +52,43 @@ class BaseService[M: BaseModel]:
         db_model = await self.mongo_service.delete(model_id)
         model_schema_class = BaseDelete(**db_model)
         return model_schema_class
+
+    def get_projection(self, fields: list[str] | None = None) -> dict[str, int]:
+        """Projection of the schema fields, narrowed to the requested ones if any."""
+        schema_fields = [
+            field.alias or name
+            for name, field in self.model_schema_class.model_fields.items()
+        ]
+        if fields:
+            unknown = set(fields) - set(schema_fields)
+            if unknown:
+                raise PaginationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+            schema_fields = fields
+        return {field: 1 for field in schema_fields}
+
+    def get_sort_value_types(self, sort_field: str) -> tuple[type, ...]:
+        """Types the values of the sort field may have, None included if it is optional."""
+        if sort_field == "_id":
+            return (ObjectId,)
+        annotation = self.model_schema_class.model_fields[sort_field].annotation
+        return get_args(annotation) or (annotation,)
+
+    async def paginate(
+        self,
+        find_page: Callable[..., AsyncIOMotorCursor],
+        sort_field: str,
+        limit: int,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream the page of models that follows the cursor, as found by `find_page`."""
+        after = (
+            decode_cursor(cursor, sort_field, self.get_sort_value_types(sort_field))
+            if cursor
+            else None
+        )
+        projection = self.get_projection(fields) | {sort_field: 1}
+        documents = find_page(
+            limit=limit, after=after, projection=projection, sort_field=sort_field
+        )
+        return await stream_page(documents, sort_field, limit)
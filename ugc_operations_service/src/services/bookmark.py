@@ -1,38 +1,48 @@
+from functools import partial
+from typing import AsyncIterator
 from uuid import UUID
 
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.core.config import app_settings
 from src.db.mongo import get_mongo_client
 from src.schemas.bookmark import Bookmark, BookmarkCreate
 from src.services.base import BaseService
-from src.services.data_repository.mongo import MongoService
+from src.services.data_repository.mongo import get_mongo_service
 
 
 class BookmarkService(BaseService):
     """Service class for managing bookmarks, extending the BaseService."""
 
     async def create_bookmark(self, bookmark: BookmarkCreate) -> Bookmark:
-        """Create a new bookmark."""
-        _bookmark = await self.mongo_service.get_bookmarks_by_user_id_and_movie_id(
-            bookmark.user_id, bookmark.movie_id
+        """Create a new bookmark, or return the user's existing one for the movie."""
+        return await self.mongo_service.get_or_create(
+            {"user_id": bookmark.user_id, "movie_id": bookmark.movie_id}, bookmark
         )
-        if _bookmark:
-            return _bookmark[0]
-        return await self.mongo_service.create(bookmark)
 
-    async def get_bookmarks_by_user_id(self, user_id: UUID) -> list[Bookmark]:
-        """Retrieve all bookmarks by user identifier."""
-        db_bookmarks = await self.mongo_service.get_bookmarks_by_user_id(user_id)
-        return [
-            self.model_schema_class.model_validate(bookmark)
-            for bookmark in db_bookmarks
-        ]
+    async def get_bookmarks_by_user_id(
+        self,
+        user_id: UUID,
+        limit: int = app_settings.pagination_size,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a page of bookmarks by user identifier, newest first."""
+        return await self.paginate(
+            partial(self.mongo_service.get_bookmarks_by_user_id, user_id),
+            "_id",
+            limit,
+            cursor,
+            fields,
+        )
 
 
-def get_bookmark_service() -> BookmarkService:
+def get_bookmark_service(
+    client: AsyncIOMotorClient = Depends(get_mongo_client),
+) -> BookmarkService:
     """Dependency function to get an instance of the BookmarkService."""
-    client = get_mongo_client()
     return BookmarkService(
         model_schema_class=Bookmark,
-        mongo_service=MongoService(
-            client=client, collection_name="bookmarks", model_class=Bookmark
-        ),
+        mongo_service=get_mongo_service(client, "bookmarks", Bookmark),
     )
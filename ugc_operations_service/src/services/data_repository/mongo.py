@@ -1,13 +1,22 @@
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Type
 from uuid import UUID
 
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCursor
+from pydantic import BaseModel
 from pydantic_mongo import ObjectIdField
+from pymongo.errors import DuplicateKeyError
 
 from src.schemas.bookmark import Bookmark
 from src.schemas.like import Like
 from src.schemas.review import Review
 from src.services.data_repository.mongo_crud import MongoDBCrudService
 
+# one {review_id, user_id, vote} document per user and review, vote being the counter
+REVIEW_VOTES = "review_votes"
+
 
 class MongoService(MongoDBCrudService):
     """MongoDB service for all models."""
@@ -30,8 +39,17 @@ class MongoService(MongoDBCrudService):
     async def get_likes_by_user_id(self, user_id: UUID):
         return await self.collection.find({"user_id": user_id}).to_list(None)
 
-    async def get_likes_by_movie_id(self, movie_id: UUID):
-        return await self.collection.find({"movie_id": movie_id}).to_list(None)
+    def get_likes_by_movie_id(
+        self,
+        movie_id: UUID,
+        limit: int,
+        after: tuple[Any, ObjectId] | None = None,
+        projection: dict[str, int] | None = None,
+        sort_field: str = "_id",
+    ) -> AsyncIOMotorCursor:
+        return self.find_page(
+            {"movie_id": movie_id}, sort_field, limit, after, projection
+        )
 
     async def get_likes_by_user_id_and_movie_id(self, user_id: UUID, movie_id: UUID):
         return await self.collection.find(
@@ -76,8 +94,47 @@ class MongoService(MongoDBCrudService):
     async def get_reviews_by_user_id(self, user_id: UUID):
         return await self.collection.find({"user_id": user_id}).to_list(None)
 
-    async def get_reviews_by_movie_id(self, movie_id: UUID):
-        return await self.collection.find({"movie_id": movie_id}).to_list(None)
+    async def vote_review(self, review_id: ObjectIdField, user_id: UUID, counter: str):
+        """
+        Counts the vote of the user for the review once. The vote is recorded in the review_votes
+        collection, which returns the previous vote of the user in the same write; the counters
+        then follow with one $inc: a first vote increments the counter, a vote of the other kind is
+        moved to this counter and a repeated vote changes nothing. Returns the review, or None if
+        it does not exist.
+        """
+        key = {"review_id": review_id, "user_id": user_id}
+        votes = self.db[REVIEW_VOTES]
+        try:
+            previous = await votes.find_one_and_update(
+                key, {"$set": {"vote": counter}}, {"vote": 1, "_id": 0}, upsert=True
+            )
+        except DuplicateKeyError:
+            # a concurrent vote of the user inserted the document in between
+            previous = await votes.find_one_and_update(
+                key, {"$set": {"vote": counter}}, {"vote": 1, "_id": 0}
+            )
+        previous_counter = previous and previous["vote"]
+        if previous_counter == counter:
+            return await self.collection.find_one({"_id": review_id})
+        counters = {counter: 1}
+        if previous_counter:
+            counters[previous_counter] = -1
+        review = await self.increment(review_id, counters)
+        if review is None:
+            await votes.delete_one(key)
+        return review
+
+    def get_reviews_by_movie_id(
+        self,
+        movie_id: UUID,
+        limit: int,
+        after: tuple[Any, ObjectId] | None = None,
+        projection: dict[str, int] | None = None,
+        sort_field: str = "date_published",
+    ) -> AsyncIOMotorCursor:
+        return self.find_page(
+            {"movie_id": movie_id}, sort_field, limit, after, projection
+        )
 
     async def get_reviews_by_user_id_and_movie_id(self, user_id: UUID, movie_id: UUID):
         return await self.collection.find(
@@ -294,8 +351,17 @@ class MongoService(MongoDBCrudService):
     async def delete_bookmark(self, bookmark_id: ObjectIdField):
         return await self.delete(bookmark_id)
 
-    async def get_bookmarks_by_user_id(self, user_id: UUID):
-        return await self.collection.find({"user_id": user_id}).to_list(None)
+    def get_bookmarks_by_user_id(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: tuple[Any, ObjectId] | None = None,
+        projection: dict[str, int] | None = None,
+        sort_field: str = "_id",
+    ) -> AsyncIOMotorCursor:
+        return self.find_page(
+            {"user_id": user_id}, sort_field, limit, after, projection
+        )
 
     async def get_bookmarks_by_movie_id(self, movie_id: UUID):
         return await self.collection.find({"movie_id": movie_id}).to_list(None)
@@ -306,3 +372,13 @@ class MongoService(MongoDBCrudService):
         return await self.collection.find(
             {"user_id": user_id, "movie_id": movie_id}
         ).to_list(None)
+
+
+@lru_cache(maxsize=16)
+def get_mongo_service(
+    client: AsyncIOMotorClient, collection_name: str, model_class: Type[BaseModel]
+) -> MongoService:
+    """Get the MongoService of a collection, created once per client."""
+    return MongoService(
+        client=client, collection_name=collection_name, model_class=model_class
+    )
@@ -1,9 +1,11 @@
 from typing import Type, List, Any
 
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCursor
 from pydantic import BaseModel
 from pydantic_mongo import ObjectIdField
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from src.schemas.base import BaseDelete
 from src.core.config import mongo_settings
@@ -27,8 +29,11 @@ class MongoDBCrudService[M](DataStorageService):
         get_all: Retrieves a list of all documents in the collection.
         get_by_id: Retrieves a document by its unique ObjectId.
         create: Creates a new document in the collection based on the Pydantic model data.
+        get_or_create: Returns the document with a key, creating it if there is none.
         update: Updates a document identified by ObjectId with the data from the Pydantic model.
         delete: Removes a document from the collection by its unique ObjectId.
+        find_page: Returns a cursor over one keyset-paginated page of documents.
+        increment: Atomically increments counters of a document and returns it updated.
     """
 
     def __init__(
@@ -42,7 +47,7 @@ class MongoDBCrudService[M](DataStorageService):
             model_class (Type[M]): The Pydantic model class for data validation and serialization.
         """
         self.db_name = mongo_settings.db
-        self.db = AsyncIOMotorDatabase(client, self.db_name)
+        self.db = client[self.db_name]
         self.collection = self.db.get_collection(collection_name)
         self.model_class = model_class
 
@@ -64,6 +69,31 @@ class MongoDBCrudService[M](DataStorageService):
         document["_id"] = result.inserted_id
         return self.model_class.parse_obj(document)
 
+    async def get_or_create(
+        self,
+        key: dict[str, Any],
+        model_schema: BaseModel,
+        projection: dict[str, int] | None = None,
+    ) -> M:
+        """
+        Returns the document matching the key, or creates it from the Pydantic model data if there is
+        none, in a single upsert. The key must be covered by a unique index, so that concurrent calls
+        cannot create it twice.
+        """
+        document = model_schema.dict(by_alias=True, exclude_none=True)
+        try:
+            document = await self.collection.find_one_and_update(
+                key,
+                {"$setOnInsert": document},
+                projection=projection,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # a concurrent upsert inserted the document in between
+            document = await self.collection.find_one(key, projection)
+        return self.model_class.parse_obj(document)
+
     async def update(self, model_id: ObjectIdField, model_schema: M) -> M:
         """Updates a document identified by ObjectId with data from the Pydantic model."""  # TODO - fix return type
         document = model_schema.dict(by_alias=True, exclude_none=True)
@@ -84,3 +114,59 @@ class MongoDBCrudService[M](DataStorageService):
             acknowledged=result.acknowledged,
         ).dict(by_alias=True, exclude_none=True)
         return document
+
+    def find_page(
+        self,
+        query: dict[str, Any],
+        sort_field: str,
+        limit: int,
+        after: tuple[Any, ObjectId] | None = None,
+        projection: dict[str, int] | None = None,
+    ) -> AsyncIOMotorCursor:
+        """
+        Returns a cursor over at most `limit` raw documents matching the query, in descending
+        (sort_field, _id) order, starting after the (value, _id) key of the last document
+        of the previous page. Seeking by key keeps the cost of a page independent of its depth.
+        """
+        if after is not None:
+            query = {"$and": [query, keyset_filter(sort_field, *after)]}
+        sort = [("_id", DESCENDING)]
+        if sort_field != "_id":
+            sort.insert(0, (sort_field, DESCENDING))
+        return self.collection.find(query, projection).sort(sort).limit(limit)
+
+    async def increment(
+        self,
+        model_id: ObjectIdField,
+        counters: dict[str, int],
+        condition: dict[str, Any] | None = None,
+        update: dict[str, Any] | None = None,
+        projection: dict[str, int] | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Atomically increments the counters of the document identified by ObjectId if it also matches
+        the condition, applying the other update operators in the same write. Returns the raw updated
+        document, or None if no document matched.
+        """
+        return await self.collection.find_one_and_update(
+            {"_id": model_id, **(condition or {})},
+            {"$inc": counters, **(update or {})},
+            projection=projection,
+            return_document=ReturnDocument.AFTER,
+        )
+
+
+def keyset_filter(sort_field: str, value: Any, last_id: ObjectId) -> dict[str, Any]:
+    """Filter of the documents that follow the (value, last_id) key in descending order."""
+    if sort_field == "_id":
+        return {"_id": {"$lt": last_id}}
+    if value is None:
+        return {sort_field: None, "_id": {"$lt": last_id}}
+    # nulls sort last in descending order and are not matched by $lt
+    return {
+        "$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": last_id}},
+            {sort_field: None},
+        ]
+    }
@@ -1,37 +1,56 @@
+from functools import partial
+from typing import AsyncIterator
 from uuid import UUID
 
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.core.config import app_settings
 from src.db.mongo import get_mongo_client
-from src.schemas.like import Like, LikeCreate
+from src.schemas.like import Like, LikeCreate, LikeSort
 from src.services.base import BaseService
-from src.services.data_repository.mongo import MongoService
+from src.services.data_repository.mongo import get_mongo_service
+
+
+# _id grows with the insertion time, so it orders likes by date
+SORT_FIELDS = {
+    LikeSort.DATE: "_id",
+    LikeSort.SCORE: "score",
+}
 
 
 class LikeService(BaseService):
     """Service class for managing bookmarks, extending the BaseService."""
 
     async def create_like(self, like: LikeCreate) -> Like:
-        """Create a new like."""
-        _like = await self.mongo_service.get_likes_by_user_id_and_movie_id(
-            like.user_id, like.movie_id
+        """Create a new like, or return the user's existing one for the movie."""
+        return await self.mongo_service.get_or_create(
+            {"user_id": like.user_id, "movie_id": like.movie_id}, like
         )
-        if _like:
-            return _like[0]
-        return await self.mongo_service.create(like)
 
     async def get_likes_by_movie_id(
-        self, movie_id: UUID, sort: str = "date"
-    ) -> list[Like]:
-        """Retrieve all likes by movie identifier."""
-        db_likes = await self.mongo_service.get_likes_by_movie_id(movie_id)
-        return [self.model_schema_class.model_validate(like) for like in db_likes]
+        self,
+        movie_id: UUID,
+        sort: LikeSort = LikeSort.DATE,
+        limit: int = app_settings.pagination_size,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a page of likes by movie identifier in the sort order."""
+        return await self.paginate(
+            partial(self.mongo_service.get_likes_by_movie_id, movie_id),
+            SORT_FIELDS[sort],
+            limit,
+            cursor,
+            fields,
+        )
 
 
-def get_like_service() -> LikeService:
+def get_like_service(
+    client: AsyncIOMotorClient = Depends(get_mongo_client),
+) -> LikeService:
     """Dependency function to get an instance of the LikeService."""
-    client = get_mongo_client()
     return LikeService(
         model_schema_class=Like,
-        mongo_service=MongoService(
-            client=client, collection_name="likes", model_class=Like
-        ),
+        mongo_service=get_mongo_service(client, "likes", Like),
     )
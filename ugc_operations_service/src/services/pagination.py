@@ -0,0 +1,73 @@
+import base64
+import binascii
+from typing import Any, AsyncIterator
+
+import orjson
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCursor
+
+from src.exceptions.pagination import PaginationError
+
+
+def encode_cursor(document: dict[str, Any], sort_field: str) -> str:
+    """Opaque token of the (sort value, _id) key of the last document of a page."""
+    key = json_util.dumps([sort_field, document.get(sort_field), document["_id"]])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, sort_field: str, value_types: tuple[type, ...]
+) -> tuple[Any, ObjectId]:
+    """
+    Returns the (sort value, _id) key encoded in a cursor token of the sort order. The value
+    goes into the query, so it must be one of the value types of the sort field: a token
+    carrying e.g. an operator document is rejected.
+    """
+    try:
+        cursor_field, value, last_id = json_util.loads(base64.urlsafe_b64decode(cursor))
+        key = value, ObjectId(last_id)
+    except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+        raise PaginationError(f"Invalid cursor: {cursor}") from e
+    if cursor_field != sort_field:
+        raise PaginationError("The cursor belongs to another sort order")
+    # bool is an int, but never the value of a sort field
+    if isinstance(value, bool) or not isinstance(value, value_types):
+        raise PaginationError(f"Invalid cursor: {cursor}")
+    return key
+
+
+async def stream_page(
+    documents: AsyncIOMotorCursor, sort_field: str, limit: int
+) -> AsyncIterator[bytes]:
+    """
+    Fetches the first batch of the page and returns a stream of it as
+    `{"items": [...], "next_cursor": ...}`, written while the rest is fetched from Mongo.
+    A failing query raises here, before the response has started, rather than in the
+    middle of a 200 response. Documents are written as stored, without a round-trip
+    through the Pydantic models; `next_cursor` is null when the page is the last one.
+    """
+    first = await anext(documents, None)
+    return write_page(first, documents, sort_field, limit)
+
+
+async def write_page(
+    first: dict[str, Any] | None,
+    documents: AsyncIOMotorCursor,
+    sort_field: str,
+    limit: int,
+) -> AsyncIterator[bytes]:
+    yield b'{"items":['
+    count = 0
+    last = None
+    if first is not None:
+        yield orjson.dumps(first, default=str)
+        count = 1
+        last = first
+        async for document in documents:
+            yield b","
+            yield orjson.dumps(document, default=str)
+            count += 1
+            last = document
+    next_cursor = encode_cursor(last, sort_field) if count == limit else None
+    yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
@@ -1,56 +1,77 @@
+from functools import partial
+from typing import AsyncIterator
 from uuid import UUID
 
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic_mongo import ObjectIdField
 
+from src.core.config import app_settings
 from src.db.mongo import get_mongo_client
-from src.schemas.review import Review, ReviewCreate
+from src.schemas.review import Review, ReviewCreate, ReviewSort
 from src.services.base import BaseService
-from src.services.data_repository.mongo import MongoService
+from src.services.data_repository.mongo import get_mongo_service
+
+
+# newest first for dates, highest first for counters and scores
+SORT_FIELDS = {
+    ReviewSort.DATE: "date_published",
+    ReviewSort.LIKES: "likes",
+    ReviewSort.DISLIKES: "dislikes",
+    ReviewSort.MOVIE_SCORE: "movie_score",
+}
 
 
 class ReviewService(BaseService):
     """Service class for managing bookmarks, extending the BaseService."""
 
     async def create_review(self, review: ReviewCreate) -> Review:
-        _review = await self.mongo_service.get_reviews_by_user_id_and_movie_id(
-            review.user_id, review.movie_id
+        """Create a new review, or return the user's existing one for the movie."""
+        return await self.mongo_service.get_or_create(
+            {"user_id": review.user_id, "movie_id": review.movie_id}, review
         )
-        if _review:
-            return _review[0]
-        return await self.mongo_service.create(review)
 
     async def get_reviews_by_movie_id(
-        self, movie_id: UUID, sort: str = "date"
-    ) -> list[Review]:
-        """Retrieve all reviews by movie identifier."""
-        db_reviews = await self.mongo_service.get_reviews_by_movie_id(movie_id)
-        return [self.model_schema_class.model_validate(review) for review in db_reviews]
-
-    async def like_review(self, review_id: ObjectIdField) -> Review:
-        """Like a review."""
-        db_review = await self.mongo_service.get_by_id(review_id)
-        db_review.likes += 1
-        db_review_dict = db_review.model_dump(exclude={"_id"})
-        update_doc = ReviewCreate(**db_review_dict)
-        db_model = await self.mongo_service.update(review_id, update_doc)
-        return self.model_schema_class.model_validate(db_model)
-
-    async def dislike_review(self, review_id: ObjectIdField) -> Review:
-        """Dislike a review."""
-        db_review = await self.mongo_service.get_by_id(review_id)
-        db_review.dislikes += 1
-        db_review_dict = db_review.model_dump(exclude={"_id"})
-        update_doc = ReviewCreate(**db_review_dict)
-        db_model = await self.mongo_service.update(review_id, update_doc)
-        return self.model_schema_class.model_validate(db_model)
-
-
-def get_review_service() -> ReviewService:
+        self,
+        movie_id: UUID,
+        sort: ReviewSort = ReviewSort.DATE,
+        limit: int = app_settings.pagination_size,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a page of reviews by movie identifier in the sort order."""
+        return await self.paginate(
+            partial(self.mongo_service.get_reviews_by_movie_id, movie_id),
+            SORT_FIELDS[sort],
+            limit,
+            cursor,
+            fields,
+        )
+
+    async def like_review(
+        self, review_id: ObjectIdField, user_id: UUID
+    ) -> Review | None:
+        """Like a review on behalf of the user, once."""
+        db_review = await self.mongo_service.vote_review(review_id, user_id, "likes")
+        if not db_review:
+            return None
+        return self.model_schema_class.model_validate(db_review)
+
+    async def dislike_review(
+        self, review_id: ObjectIdField, user_id: UUID
+    ) -> Review | None:
+        """Dislike a review on behalf of the user, once."""
+        db_review = await self.mongo_service.vote_review(review_id, user_id, "dislikes")
+        if not db_review:
+            return None
+        return self.model_schema_class.model_validate(db_review)
+
+
+def get_review_service(
+    client: AsyncIOMotorClient = Depends(get_mongo_client),
+) -> ReviewService:
     """Dependency function to get an instance of the ReviewService."""
-    client = get_mongo_client()
     return ReviewService(
         model_schema_class=Review,
-        mongo_service=MongoService(
-            client=client, collection_name="reviews", model_class=Review
-        ),
+        mongo_service=get_mongo_service(client, "reviews", Review),
     )
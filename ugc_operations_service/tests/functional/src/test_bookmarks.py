@@ -27,7 +27,9 @@ async def test_get_bookmarks(ugc_api_bookmarks_url, access_token):
             assert (
                 response.status == HTTPStatus.OK
             ), f"API response status is not {HTTPStatus.OK}"
-            body = await response.json()
+            page = await response.json()
+            assert "next_cursor" in page
+            body = page["items"]
             assert isinstance(body, list)
             assert len(body) >= 0
             assert all([bookmark["user_id"] == USER_ID for bookmark in body])
@@ -67,6 +69,20 @@ async def test_create_bookmark_ok(
             BOOKMARK_ID_TO_DELETE = body["_id"]
 
 
+async def test_create_bookmark_duplicate(ugc_api_bookmarks_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_bookmarks_url}/"
+        test_data = {"user_id": USER_ID, "movie_id": MOVIE_ID}
+
+        async with session.post(url, json=test_data) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            body = await response.json()
+            assert body["_id"] == BOOKMARK_ID_TO_DELETE
+
+
 @pytest.mark.parametrize(
     "test_data, expected",
     [
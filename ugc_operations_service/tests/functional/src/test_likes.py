@@ -28,7 +28,9 @@ async def test_get_likes(ugc_api_likes_url, access_token):
             assert (
                 response.status == HTTPStatus.OK
             ), f"API response status is not {HTTPStatus.OK}"
-            body = await response.json()
+            page = await response.json()
+            assert "next_cursor" in page
+            body = page["items"]
             assert isinstance(body, list)
             assert len(body) >= 0
             assert all([x["movie_id"] == MOVIE_ID for x in body])
@@ -37,6 +39,17 @@ async def test_get_likes(ugc_api_likes_url, access_token):
             assert all(["score" in x for x in body])
 
 
+async def test_get_likes_invalid_cursor(ugc_api_likes_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_likes_url}/{MOVIE_ID}?cursor=invalid"
+
+        async with session.get(url) as response:
+            assert (
+                response.status == HTTPStatus.BAD_REQUEST
+            ), f"API response status is not {HTTPStatus.BAD_REQUEST}"
+
+
 @pytest.mark.parametrize(
     "test_data, expected",
     [
@@ -90,6 +103,31 @@ async def test_create_like_ok(ugc_api_likes_url, access_token, test_data, expect
             assert body["score"] == test_data["score"]
 
 
+async def test_create_like_duplicate(ugc_api_likes_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_likes_url}/"
+        test_data = {
+            "user_id": USER_ID,
+            "movie_id": "3fa85f64-5717-4562-b3fc-2c963f64afa9",
+            "score": 8,
+        }
+
+        async with session.post(url, json=test_data) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            existing = await response.json()
+
+        async with session.post(url, json={**test_data, "score": 1}) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            body = await response.json()
+            assert body["_id"] == existing["_id"]
+            assert body["score"] == existing["score"]
+
+
 @pytest.mark.parametrize(
     "test_data, expected",
     [
@@ -286,7 +324,7 @@ async def test_update_like_wo_auth(ugc_api_likes_url):
     [
         (
             {
-                "user_id": USER_ID,
+                "user_id": "3fa85f64-5717-4562-b3fc-2c333f64afa6",
                 "movie_id": MOVIE_ID,
                 "score": 3,
             },
@@ -311,7 +349,7 @@ async def test_update_like_wo_auth(ugc_api_likes_url):
         (
             {
                 "user_id": USER_ID,
-                "movie_id": MOVIE_ID,
+                "movie_id": "3fa85f64-5717-4562-b3fc-2c963f64afa6",
                 "score": 10,
             },
             {"status": HTTPStatus.OK},
@@ -334,6 +372,19 @@ async def test_update_like_ok(ugc_api_likes_url, access_token, test_data, expect
             assert body["score"] == test_data["score"]
 
 
+async def test_update_like_conflict(ugc_api_likes_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_likes_url}/{LIKE_ID_TO_UPDATE}"
+        # the pair of a like created by test_create_like_ok
+        test_data = {"user_id": USER_ID, "movie_id": MOVIE_ID, "score": 1}
+
+        async with session.put(url, json=test_data) as response:
+            assert (
+                response.status == HTTPStatus.CONFLICT
+            ), f"API response status is not {HTTPStatus.CONFLICT}"
+
+
 @pytest.mark.parametrize(
     "test_data, expected",
     [
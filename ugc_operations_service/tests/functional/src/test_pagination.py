@@ -0,0 +1,72 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession
+from http import HTTPStatus
+
+pytestmark = pytest.mark.asyncio
+PAGINATION_MOVIE_ID = str(uuid.uuid4())
+# ties and nulls of the sort field across page boundaries
+MOVIE_SCORES = [7, 5, None, 5, 5, None, 3, None, 5, 7]
+
+
+@pytest_asyncio.fixture
+async def movie_reviews(ugc_api_reviews_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    reviews = []
+    async with ClientSession(headers=headers) as session:
+        for movie_score in MOVIE_SCORES:
+            review = {
+                "user_id": str(uuid.uuid4()),
+                "movie_id": PAGINATION_MOVIE_ID,
+                "text": "string",
+                "movie_score": movie_score,
+            }
+            async with session.post(f"{ugc_api_reviews_url}/", json=review) as response:
+                assert (
+                    response.status == HTTPStatus.CREATED
+                ), f"API response status is not {HTTPStatus.CREATED}"
+                reviews.append(await response.json())
+        yield reviews
+        for review in reviews:
+            async with session.delete(f"{ugc_api_reviews_url}/{review['_id']}"):
+                pass
+
+
+async def fetch_all_pages(session, url, sort, limit):
+    items, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        async with session.get(url, params=params) as response:
+            assert (
+                response.status == HTTPStatus.OK
+            ), f"API response status is not {HTTPStatus.OK}"
+            page = await response.json()
+        assert len(page["items"]) <= limit
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("sort", ["movie_score", "likes", "date"])
+@pytest.mark.parametrize("limit", [1, 2, 3, 4])
+async def test_reviews_pages_skip_and_repeat_nothing(
+    ugc_api_reviews_url, access_token, movie_reviews, sort, limit
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_reviews_url}/{PAGINATION_MOVIE_ID}"
+        items = await fetch_all_pages(session, url, sort, limit)
+
+    ids = [item["_id"] for item in items]
+    assert len(ids) == len(set(ids)), "a review is repeated across pages"
+    assert set(ids) == {review["_id"] for review in movie_reviews}
+    if sort == "movie_score":
+        scores = [item.get("movie_score") for item in items]
+        assert scores == sorted(
+            MOVIE_SCORES, key=lambda score: -1 if score is None else score, reverse=True
+        ), "reviews are not in descending score order with nulls last"
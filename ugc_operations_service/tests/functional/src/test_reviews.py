@@ -50,6 +50,21 @@ async def test_create_review_ok(ugc_api_reviews_url, access_token, test_data, ex
             REVIEW_ID_TO_DELETE = body["_id"]
 
 
+async def test_create_review_duplicate(ugc_api_reviews_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_reviews_url}/"
+        test_data = {"user_id": USER_ID, "movie_id": MOVIE_ID, "text": "another"}
+
+        async with session.post(url, json=test_data) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            body = await response.json()
+            assert body["_id"] == REVIEW_ID_TO_DELETE
+            assert body["text"] == "string"
+
+
 @pytest.mark.parametrize(
     "test_data, expected",
     [
@@ -145,7 +160,9 @@ async def test_get_reviews(ugc_api_reviews_url, access_token):
             assert (
                 response.status == HTTPStatus.OK
             ), f"API response status is not {HTTPStatus.OK}"
-            body = await response.json()
+            page = await response.json()
+            assert "next_cursor" in page
+            body = page["items"]
             assert isinstance(body, list)
             assert len(body) >= 0
             assert all([review["_id"] for review in body])
@@ -178,6 +195,24 @@ async def test_review_dislike_wo_auth(ugc_api_reviews_url):
             ), f"API response status is not {HTTPStatus.UNAUTHORIZED}"
 
 
+async def test_review_like_once(ugc_api_reviews_url, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with ClientSession(headers=headers) as session:
+        url = f"{ugc_api_reviews_url}/{REVIEW_ID_TO_DELETE}/like"
+
+        async with session.post(url) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            likes = (await response.json())["likes"]
+
+        async with session.post(url) as response:
+            assert (
+                response.status == HTTPStatus.CREATED
+            ), f"API response status is not {HTTPStatus.CREATED}"
+            assert (await response.json())["likes"] == likes
+
+
 async def test_delete_review_wo_auth(ugc_api_reviews_url):
     async with ClientSession() as session:
         url = f"{ugc_api_reviews_url}/{REVIEW_ID_TO_DELETE}"
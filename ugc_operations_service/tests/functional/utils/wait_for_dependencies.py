@@ -2,7 +2,7 @@ import asyncio
 import logging
 import time
 
-from src.db.mongo import get_mongo_client
+from src.db.mongo import create_mongo_client
 
 
 def check_connection(
@@ -39,7 +39,7 @@ def check_connection(
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
-    mongo_client = get_mongo_client()
+    mongo_client = create_mongo_client()
     if not check_connection(mongo_client.server_info(), "MongoDB"):
         logging.error("Failed to establish a connection to MongoDB. Exiting...")
         exit(1)
@@ -1,244 +1,161 @@
+from datetime import datetime
+from functools import wraps
+from enum import Enum
 from http import HTTPStatus
 from json import JSONDecodeError
+from uuid import UUID
 
-from core.config import authorizations, app_settings
+from core.config import authorizations, app_settings, rate_limit_settings
 from core.logger_class import Logger
-from flask import Response, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask import Response, g, request
 from flask_restx import Namespace, Resource, fields
-from schemas.bookmark import Bookmark
-from schemas.click import Click
-from schemas.comment import Comment
-from schemas.like import Like
-from schemas.movie_filter_request import MovieFilterRequest
-from schemas.movie_player_change import MoviePlayerChange
-
-from app.core.config import kafka_settings
-from app.schemas.movie_watch_time import MovieWatchTime
+from pydantic import BaseModel
+
+from app.services.auth import (
+    InvalidTokenError,
+    get_bearer_token,
+    get_token_identity,
+)
+from app.services.event_batch import (
+    batch_summary,
+    parse_events_batch,
+    prepare_batch,
+)
+from app.services.event_registry import EventRoute, event_registry
 from app.services.kafka import KafkaProducerService
+from app.services.rate_limiter import EventSampler, get_rate_limiter
+from app.services.serializers import event_serializer
+from app.services.spool import get_event_spool
 
-kafka_producer_service = KafkaProducerService()
+event_spool = get_event_spool()
+kafka_producer_service = KafkaProducerService(
+    headers=event_serializer.headers, spool=event_spool
+)
 
 events_namespace = Namespace(
     "events", description="Operations related to events", authorizations=authorizations
 )
 
-movie_watch_time_model = events_namespace.model(
-    name="MovieWatchTime",
-    model={
-        "movie_id": fields.String(),
-        "seconds_amt": fields.Integer(),
-        "total_seconds_amt": fields.Integer(),
-        "created_at": fields.DateTime(),
-    },
-)
-click_model = events_namespace.model(
-    name="Click", model={"resource": fields.String(), "created_at": fields.DateTime()}
-)
-bookmark_model = events_namespace.model(
-    name="Bookmark", model={"movie_id": fields.String()}
-)
-like_model = events_namespace.model(
-    name="Like",
-    model={
-        "movie_id": fields.String(),
-        "resource": fields.String(),
-        "created_at": fields.DateTime(),
-    },
-)
-comment_model = events_namespace.model(
-    name="Comment",
-    model={
-        "movie_id": fields.String(),
-        "content": fields.String(),
-        "created_at": fields.DateTime(),
-    },
-)
-movie_player_change_model = events_namespace.model(
-    name="MoviePlayerChange",
-    model={
-        "movie_id": fields.String(),
-        "change_type": fields.String(),
-        "old_value": fields.String(),
-        "new_value": fields.String(),
-    },
-)
-movie_filter_request_model = events_namespace.model(
-    name="MovieFilterRequest", model={"filters": fields.String()}
-)
-
-logger = Logger(app_settings.log_path, app_settings.level)
-
-
-@events_namespace.route("/movie-watch-time")
-class MovieWatchTimeAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
-
-    @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(movie_watch_time_model)
-    def post(self):
-        """Sends movie timestamp to Kafka."""
-
-        logger.write_log(
-            messages="MovieWatchTimeAPI", request_id=request.headers.get("X-Request-Id")
-        )
-        movie_watch_time = MovieWatchTime(**request.get_json())
-        movie_watch_time.user_id = get_jwt_identity()
-
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.movie_watch_times_topic,
-            message=movie_watch_time.model_dump_json(),
-            key=movie_watch_time.user_id or "Anonymous",
-        )
-
-        return Response(status=HTTPStatus.OK)
-
-
-@events_namespace.route("/click")
-class ClickAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
-
-    @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(click_model)
-    def post(self):
-        """Sends user's click to Kafka."""
+logger = Logger(app_settings.log_path, app_settings.log_level)
+rate_limiter = get_rate_limiter()
+event_sampler = EventSampler(rate_limit_settings.sampling)
+
+doc_field_types = {
+    UUID: fields.String,
+    str: fields.String,
+    int: fields.Integer,
+    float: fields.Float,
+    datetime: fields.DateTime,
+}
+
+
+def doc_model(schema: type[BaseModel]):
+    """Builds the swagger model of an event from its pydantic schema."""
+    model = {}
+    for name, field_info in schema.model_fields.items():
+        if name == "user_id":
+            continue
+        annotation = field_info.annotation
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            model[name] = fields.String(enum=[item.value for item in annotation])
+        else:
+            model[name] = doc_field_types.get(annotation, fields.Raw)()
+    return events_namespace.model(name=schema.__name__, model=model)
+
+
+def jwt_optional(fn):
+    """Optional JWT authentication backed by the verified-token cache.
+
+    Stores the token subject (or None without a token) in ``g.user_id``.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = get_bearer_token(request.headers.get("Authorization"))
+        try:
+            g.user_id = get_token_identity(token) if token else None
+        except InvalidTokenError as e:
+            return {"msg": str(e)}, HTTPStatus.UNAUTHORIZED
+        return fn(*args, **kwargs)
 
-        logger.write_log(
-            messages="ClickAPI", request_id=request.headers.get("X-Request-Id")
-        )
-        click = Click(**request.get_json())
-        click.user_id = get_jwt_identity()
+    return wrapper
 
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.clicks_topic,
-            message=click.model_dump_json(),
-            key=click.user_id or "Anonymous",
-        )
 
-        return Response(status=HTTPStatus.OK)
+def rate_limited(user_id: str | None, cost: int = 1) -> bool:
+    """Checks the token bucket of the user, or of the client IP for anonymous users."""
+    if rate_limiter is None:
+        return False
+    client = user_id or request.headers.get("X-Real-IP") or request.remote_addr
+    return not rate_limiter.allow(str(client), cost)
 
 
-@events_namespace.route("/like")
-class LikeAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
+def make_event_resource(route: EventRoute) -> type[Resource]:
+    """Generates the API resource that publishes one event type to Kafka."""
+    resource_name = f"{route.schema.__name__}API"
 
     @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(like_model)
+    @events_namespace.expect(doc_model(route.schema))
     def post(self):
-        """Sends user's like information to Kafka."""
-
         logger.write_log(
-            messages="LikeAPI", request_id=request.headers.get("X-Request-Id")
+            messages=resource_name, request_id=request.headers.get("X-Request-Id")
         )
-        like = Like(**request.get_json())
-        like.user_id = get_jwt_identity()
-
+        user_id = g.user_id
+        if rate_limited(user_id):
+            return Response(status=HTTPStatus.TOO_MANY_REQUESTS)
+        event = route.validate_json(request.get_data(), user_id)
+        if not event_sampler.keep(route.name):
+            return Response(status=HTTPStatus.OK)
         kafka_producer_service.produce_message(
-            topic=kafka_settings.likes_topic,
-            message=like.model_dump_json(),
-            key=like.user_id or "Anonymous",
+            topic=route.topic, message=route.serialize(event), key=route.key(event)
         )
-
         return Response(status=HTTPStatus.OK)
 
+    post.__doc__ = route.description
+    return type(
+        resource_name,
+        (Resource,),
+        {"method_decorators": [jwt_optional], "post": post},
+    )
 
-@events_namespace.route("/comment")
-class CommentAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
-
-    @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(comment_model)
-    def post(self):
-        """Sends user's comment to Kafka."""
-
-        logger.write_log(
-            messages="CommentAPI", request_id=request.headers.get("X-Request-Id")
-        )
-        comment = Comment(**request.get_json())
-        comment.user_id = get_jwt_identity()
 
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.comments_topic,
-            message=comment.model_dump_json(),
-            key=comment.user_id or "Anonymous",
-        )
+for event_route in event_registry.values():
+    events_namespace.add_resource(make_event_resource(event_route), event_route.path)
 
-        return Response(status=HTTPStatus.OK)
 
-
-@events_namespace.route("/bookmark")
-class BookmarkAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
+@events_namespace.route("/batch")
+class EventBatchAPI(Resource):
+    method_decorators = [jwt_optional]
 
     @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(bookmark_model)
     def post(self):
-        """Sends user's bookmark to Kafka."""
-
-        logger.write_log(
-            messages="BookmarkAPI", request_id=request.headers.get("X-Request-Id")
-        )
-        bookmark = Bookmark(**request.get_json())
-        bookmark.user_id = get_jwt_identity()
-
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.bookmarks_topic,
-            message=bookmark.model_dump_json(),
-            key=bookmark.user_id or "Anonymous",
-        )
+        """Sends a batch of mixed-type events to Kafka.
 
-        return Response(status=HTTPStatus.OK)
-
-
-@events_namespace.route("/movie-filter-request")
-class MovieFilterRequestAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
-
-    @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(movie_filter_request_model)
-    def post(self):
-        """Sends user's movie filter request to Kafka."""
+        The body is a JSON array or NDJSON (``application/x-ndjson``) of events,
+        each one carrying its kind in the ``type`` key. Every event is validated
+        separately and the response reports its status by position; events
+        dropped by sampling are reported as ``sampled`` and count as accepted.
+        """
 
         logger.write_log(
-            messages="MovieFilterRequestAPI",
-            request_id=request.headers.get("X-Request-Id"),
+            messages="EventBatchAPI", request_id=request.headers.get("X-Request-Id")
         )
         try:
-            movie_filter_request = MovieFilterRequest.from_json(**request.get_json())
+            raw_events = parse_events_batch(request.get_data(), request.mimetype)
         except JSONDecodeError:
-            return Response("Wrong json for filters key", status=HTTPStatus.BAD_REQUEST)
-
-        movie_filter_request.user_id = get_jwt_identity()
-
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.movie_filter_requests_topic,
-            message=movie_filter_request.model_dump_json(),
-            key=movie_filter_request.user_id or "Anonymous",
-        )
-
-        return Response(status=HTTPStatus.OK)
-
-
-@events_namespace.route("/movie-player-change")
-class MoviePlayerChangeAPI(Resource):
-    method_decorators = [jwt_required(optional=True)]
-
-    @events_namespace.doc(security="jsonWebToken")
-    @events_namespace.expect(movie_player_change_model)
-    def post(self):
-        """Sends user's movie language change request."""
-
-        logger.write_log(
-            messages="MoviePlayerChangeAPI",
-            request_id=request.headers.get("X-Request-Id"),
-        )
-        movie_player_change = MoviePlayerChange(**request.get_json())
-        movie_player_change.user_id = get_jwt_identity()
-
-        kafka_producer_service.produce_message(
-            topic=kafka_settings.movie_player_changes_topic,
-            message=movie_player_change.model_dump_json(),
-            key=movie_player_change.user_id or "Anonymous",
-        )
-
-        return Response(status=HTTPStatus.OK)
+            return Response(
+                "Wrong json for events batch", status=HTTPStatus.BAD_REQUEST
+            )
+        if len(raw_events) > app_settings.batch_max_events:
+            return Response(
+                f"Batch exceeds {app_settings.batch_max_events} events",
+                status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        user_id = g.user_id
+        if rate_limited(user_id, cost=len(raw_events)):
+            return Response(status=HTTPStatus.TOO_MANY_REQUESTS)
+
+        results, messages = prepare_batch(raw_events, user_id, event_sampler)
+        kafka_producer_service.produce_messages(messages)
+
+        return batch_summary(results), HTTPStatus.OK
@@ -0,0 +1,136 @@
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from json import JSONDecodeError
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import ValidationError
+
+from app.core.config import app_settings, rate_limit_settings
+from app.core.logger_class import Logger
+from app.services.async_kafka import AsyncKafkaProducerService
+from app.services.auth import InvalidTokenError, get_token_identity
+from app.services.event_batch import batch_summary, parse_events_batch, prepare_batch
+from app.services.event_registry import EventRoute, event_registry
+from app.services.rate_limiter import EventSampler, get_rate_limiter
+from app.services.serializers import event_serializer
+from app.services.spool import get_event_spool
+
+event_spool = get_event_spool()
+kafka_producer_service = AsyncKafkaProducerService(
+    headers=event_serializer.headers, spool=event_spool
+)
+logger = Logger(app_settings.log_path, app_settings.log_level)
+rate_limiter = get_rate_limiter()
+event_sampler = EventSampler(rate_limit_settings.sampling)
+bearer = HTTPBearer(auto_error=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await kafka_producer_service.start()
+    yield
+    await kafka_producer_service.stop()
+
+
+app = FastAPI(
+    title=app_settings.app_name,
+    description="API for user generated content",
+    lifespan=lifespan,
+)
+
+
+async def get_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> str | None:
+    """Optional JWT authentication, like ``jwt_required(optional=True)``."""
+    if credentials is None:
+        return None
+    try:
+        return get_token_identity(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail=str(e))
+
+
+def rate_limited(request: Request, user_id: str | None, cost: int = 1) -> bool:
+    """Checks the token bucket of the user, or of the client IP for anonymous users."""
+    if rate_limiter is None:
+        return False
+    client = user_id or request.headers.get("X-Real-IP") or request.client.host
+    return not rate_limiter.allow(str(client), cost)
+
+
+def make_event_endpoint(route: EventRoute):
+    """Generates the endpoint that publishes one event type to Kafka."""
+    endpoint_name = f"{route.schema.__name__}API"
+
+    async def endpoint(
+        request: Request, user_id: str | None = Depends(get_user_id)
+    ) -> Response:
+        logger.write_log(
+            messages=endpoint_name, request_id=request.headers.get("X-Request-Id")
+        )
+        if rate_limited(request, user_id):
+            return Response(status_code=HTTPStatus.TOO_MANY_REQUESTS)
+        event = route.validate_json(await request.body(), user_id)
+        if event_sampler.keep(route.name):
+            await kafka_producer_service.produce_message(
+                route.topic, route.serialize(event), route.key(event)
+            )
+        return Response(status_code=HTTPStatus.OK)
+
+    endpoint.__name__ = endpoint_name
+    endpoint.__doc__ = route.description
+    return endpoint
+
+
+for event_route in event_registry.values():
+    app.add_api_route(
+        f"/events{event_route.path}",
+        make_event_endpoint(event_route),
+        methods=["POST"],
+        tags=["events"],
+    )
+
+
+@app.post("/events/batch", tags=["events"])
+async def events_batch(
+    request: Request, user_id: str | None = Depends(get_user_id)
+) -> Response:
+    """Sends a batch of mixed-type events to Kafka, see the WSGI ``EventBatchAPI``."""
+    logger.write_log(
+        messages="EventBatchAPI", request_id=request.headers.get("X-Request-Id")
+    )
+    content_type = request.headers.get("Content-Type", "")
+    try:
+        raw_events = parse_events_batch(
+            await request.body(), content_type.split(";")[0].strip()
+        )
+    except JSONDecodeError:
+        return PlainTextResponse(
+            "Wrong json for events batch", status_code=HTTPStatus.BAD_REQUEST
+        )
+    if len(raw_events) > app_settings.batch_max_events:
+        return PlainTextResponse(
+            f"Batch exceeds {app_settings.batch_max_events} events",
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+    if rate_limited(request, user_id, cost=len(raw_events)):
+        return Response(status_code=HTTPStatus.TOO_MANY_REQUESTS)
+
+    results, messages = prepare_batch(raw_events, user_id, event_sampler)
+    await kafka_producer_service.produce_messages(messages)
+    return JSONResponse(batch_summary(results))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Exposes spool depth and drain rate in the Prometheus text format."""
+    stats = event_spool.stats() if event_spool is not None else {}
+    return "".join(f"ugc_{name} {value}\n" for name, value in stats.items())
+
+
+@app.exception_handler(ValidationError)
+async def handle_validation_error(request: Request, exc: ValidationError):
+    return JSONResponse({"error": str(exc)}, status_code=HTTPStatus.BAD_REQUEST)
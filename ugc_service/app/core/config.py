@@ -1,6 +1,7 @@
 import os
 from logging import config as logging_config
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -19,9 +20,15 @@ class AppSettings(BaseConfig):
     debug: bool = os.getenv("DEBUG", default="True").lower() == "true"
     log_level: str = "INFO"
     log_path: str = "/app/.venv/logs/ugc.log"
+    log_queue_size: int = 10000
+    log_batch_size: int = 500
+    log_flush_interval: float = 1.0
     app_name: str = "UGC API"
     project_name: str = "UGC Service"
     jwt_secret_key: str = "secretsecret"
+    jwt_cache_size: int = 10000
+    jwt_cache_max_ttl: float = 900.0
+    batch_max_events: int = 1000
 
     class Config:
         env_prefix = "app_"
@@ -37,12 +44,51 @@ class KafkaSettings(BaseConfig):
     movie_filter_requests_topic: str
     movie_player_changes_topic: str
     movie_watch_times_topic: str
+    linger_ms: int = 20
+    batch_size: int = 65536
+    compression_type: str | None = None
+    acks: int | Literal["all"] = 1
+    max_block_ms: int = 5000
+    sync_send: bool = False
+    flush_timeout: float = 10.0
+    value_format: str = "json"
+    anonymous_key: str = "spread"
 
     class Config:
         env_prefix = "kafka_"
         extra = "allow"
 
 
+class SpoolSettings(BaseConfig):
+    enabled: bool = True
+    path: str = "/app/.venv/spool"
+    max_bytes: int = 1024**3
+    segment_bytes: int = 64 * 1024**2
+    fsync_interval: float = 1.0
+    drain_rate: int = 0
+    drain_chunk_size: int = 500
+    retry_interval: float = 5.0
+    circuit_open_interval: float = 5.0
+
+    class Config:
+        env_prefix = "spool_"
+        extra = "allow"
+
+
+class RateLimitSettings(BaseConfig):
+    enabled: bool = True
+    backend: str = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    capacity: int = 1000
+    refill_rate: float = 20.0
+    max_keys: int = 100000
+    sampling: dict[str, int] = {}
+
+    class Config:
+        env_prefix = "rate_limit_"
+        extra = "allow"
+
+
 authorizations = {
     "jsonWebToken": {
         "type": "apiKey",
@@ -53,4 +99,6 @@ authorizations = {
 
 app_settings = AppSettings()
 kafka_settings = KafkaSettings()
+spool_settings = SpoolSettings()
+rate_limit_settings = RateLimitSettings()
 logging_config.dictConfig(LOGGING)
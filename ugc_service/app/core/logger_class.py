@@ -1,29 +1,121 @@
+import atexit
+import contextlib
 import datetime
 import json
+import queue
 import socket
+import sys
+import threading
+import time
 
 from core.config import app_settings
 
 
 class Logger:
+    """Structured JSON logger that writes records from a background thread.
+
+    ``write_log`` only puts the record into an in-memory queue; a daemon thread
+    (a greenlet under gevent monkey-patching) drains the queue and appends the
+    records to the log file in batches through a single open file handle.
+    The file is opened before the thread starts; if it cannot be opened or
+    written, the records go to stderr instead of piling up in the queue.
+    """
 
     map_level = {"ERROR": 1, "INFO": 2, "DEBUG": 3}
 
-    def __init__(self, log_path="app.log", level="INFO"):
+    def __init__(
+        self,
+        log_path="app.log",
+        level="INFO",
+        queue_size=app_settings.log_queue_size,
+        batch_size=app_settings.log_batch_size,
+        flush_interval=app_settings.log_flush_interval,
+    ):
         self.log_path = log_path
         self.level = level
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._static_fields = {
+            "host": socket.gethostname(),
+            "app": app_settings.app_name,
+            "service": app_settings.project_name,
+        }
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._log_file = self._open()
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(
+            target=self._run, name="ugc-log-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
 
-    def write_log(self, messages: str, request_id="0", level="INFO"):
-        if self.map_level[self.level] >= self.map_level[level]:
-            messages["level"] = level
-            messages["host"] = socket.gethostname()
-            messages["timestamp"] = str(datetime.datetime.now())
-            messages["request_id"] = str(request_id)
-            messages["app"] = app_settings.app_name
-            messages["service"] = app_settings.project_name
-            with open(self.log_path, "a") as f:
-                json.dump(messages, f)
-                f.write("\n")
+    def write_log(self, messages: str | dict, request_id="0", level="INFO"):
+        """Enqueues a log record; the record is dropped if the queue is full."""
+        if self.map_level[self.level] < self.map_level[level]:
+            return
+        record = dict(messages) if isinstance(messages, dict) else {"message": messages}
+        record["level"] = level
+        record["request_id"] = str(request_id)
+        try:
+            self._queue.put_nowait((time.time(), record))
+        except queue.Full:
+            self.dropped += 1
 
     def level_update(self, level):
         self.level = level
+
+    def close(self):
+        """Stops the writer thread after it has written all queued records."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._writer.join(timeout=self.flush_interval * 5)
+
+    def _open(self):
+        try:
+            return open(self.log_path, "a")
+        except OSError as e:
+            sys.stderr.write(f"Cannot open {self.log_path}, logging to stderr: {e}\n")
+            return sys.stderr
+
+    def _run(self):
+        try:
+            while not (self._stopped.is_set() and self._queue.empty()):
+                batch = self._take_batch()
+                if batch:
+                    self._write("".join(self._format(*item) for item in batch))
+        finally:
+            if self._log_file is not sys.stderr:
+                with contextlib.suppress(OSError):
+                    self._log_file.close()
+
+    def _write(self, lines: str):
+        try:
+            self._log_file.write(lines)
+            self._log_file.flush()
+        except OSError as e:
+            if self._log_file is sys.stderr:
+                return
+            sys.stderr.write(f"Cannot write {self.log_path}, logging to stderr: {e}\n")
+            with contextlib.suppress(OSError):
+                self._log_file.close()
+            self._log_file = sys.stderr
+            self._write(lines)
+
+    def _take_batch(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _format(self, created: float, record: dict) -> str:
+        record.update(self._static_fields)
+        record["timestamp"] = str(datetime.datetime.fromtimestamp(created))
+        return json.dumps(record) + "\n"
@@ -1,6 +1,8 @@
 import json
 from typing import Any
 
+from pydantic import field_validator
+
 from schemas.base import UserIDMixin
 
 
@@ -9,6 +11,14 @@ class MovieFilterRequest(UserIDMixin):
 
     filters: dict[str, Any]
 
+    @field_validator("filters", mode="before")
+    @classmethod
+    def parse_filters(cls, filters: Any) -> Any:
+        """Clients send filters as a JSON-encoded string."""
+        if isinstance(filters, str):
+            return json.loads(filters)
+        return filters
+
     @classmethod
     def from_json(cls, filters: str):
         parsed_data = json.loads(filters)
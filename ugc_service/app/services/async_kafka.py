@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from functools import partial
+
+from aiokafka import AIOKafkaProducer
+from aiokafka.errors import KafkaError
+
+from app.core.config import kafka_settings, spool_settings
+from app.services.kafka import CircuitBreaker
+from app.services.spool import EventSpool, SpooledRecord, SpoolDrainer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncKafkaProducerService:
+    """asyncio counterpart of ``KafkaProducerService`` for the ASGI app.
+
+    ``produce_message`` awaits only until the record is in the producer's buffer;
+    delivery is confirmed in the background and failed records go to the spool,
+    which is drained from a thread through the event loop.
+
+    With a spool, the circuit breaker of ``KafkaProducerService`` sends records
+    straight to the spool while Kafka is failing, and the app starts even if the
+    brokers are down: the connection is retried by the sends let through as
+    probes and by the drainer.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers=kafka_settings.bootstrap_servers.split(","),
+        headers: list[tuple[str, bytes]] | None = None,
+        spool: EventSpool | None = None,
+    ):
+        self._bootstrap_servers = bootstrap_servers
+        self._headers = headers
+        self.spool = spool
+        self._producer: AIOKafkaProducer | None = None
+        self._circuit = CircuitBreaker(spool_settings.circuit_open_interval)
+        self._connect_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._drainer: SpoolDrainer | None = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._connect()
+        except KafkaError as e:
+            if self.spool is None:
+                raise
+            logger.error(f"Kafka is unavailable at start, spooling events: {e}")
+            self._circuit.fail()
+        if self.spool is not None:
+            self._drainer = SpoolDrainer(
+                self.spool,
+                self._replay_threadsafe,
+                drain_rate=spool_settings.drain_rate,
+                chunk_size=spool_settings.drain_chunk_size,
+                retry_interval=spool_settings.retry_interval,
+            )
+            self._drainer.start()
+
+    async def stop(self) -> None:
+        """Flushes pending messages and stops the producer."""
+        if self._drainer is not None:
+            self._drainer.stop()
+        if self._producer is not None:
+            try:
+                await asyncio.wait_for(
+                    self._producer.flush(), timeout=kafka_settings.flush_timeout
+                )
+            except (KafkaError, asyncio.TimeoutError) as e:
+                logger.error(f"Error while flushing Kafka producer: {e}")
+            await self._producer.stop()
+        if self.spool is not None:
+            self.spool.close()
+
+    async def produce_message(
+        self, topic: str, message: bytes, key: str | None = None
+    ) -> asyncio.Future | None:
+        """Buffers a message; returns None if it was spooled instead."""
+        encoded_key = key.encode("utf-8") if key else None
+        if self.spool is not None and not self._circuit.allow():
+            self._spool(topic, message, encoded_key)
+            return None
+        try:
+            if self._producer is None:
+                await self._connect()
+            future = await self._producer.send(
+                topic, value=message, key=encoded_key, headers=self._headers
+            )
+        except KafkaError as e:
+            if self.spool is None:
+                raise
+            logger.warning(f"Spooling message to {topic}: {e}")
+            self._circuit.fail()
+            self._spool(topic, message, encoded_key)
+            return None
+        self._circuit.succeed()
+        future.add_done_callback(
+            partial(self._on_delivery, topic, message, encoded_key)
+        )
+        return future
+
+    async def produce_messages(
+        self, messages: list[tuple[str, bytes, str | None]]
+    ) -> list[asyncio.Future | None]:
+        return [
+            await self.produce_message(topic, message, key)
+            for topic, message, key in messages
+        ]
+
+    def _on_delivery(
+        self, topic: str, value: bytes, key: bytes | None, future: asyncio.Future
+    ) -> None:
+        if future.cancelled() or future.exception() is None:
+            return
+        logger.error(f"Failed to deliver message to {topic}: {future.exception()}")
+        if self.spool is not None:
+            self._circuit.fail()
+            self._spool(topic, value, key)
+
+    def _spool(self, topic: str, value: bytes, key: bytes | None) -> None:
+        record = SpooledRecord(topic, value, key, self._headers or [])
+        if not self.spool.append(record):
+            logger.error(f"Spool is full, dropping message to {topic}")
+
+    def _replay_threadsafe(self, records: list[SpooledRecord]) -> bool:
+        """Runs the replay on the event loop from the drainer thread."""
+        return asyncio.run_coroutine_threadsafe(
+            self._replay(records), self._loop
+        ).result()
+
+    async def _connect(self) -> None:
+        """Starts a new producer; a producer that failed to start is discarded."""
+        async with self._connect_lock:
+            if self._producer is None:
+                self._producer = await self._start_producer()
+
+    async def _start_producer(self) -> AIOKafkaProducer:
+        producer = AIOKafkaProducer(
+            bootstrap_servers=self._bootstrap_servers,
+            linger_ms=kafka_settings.linger_ms,
+            max_batch_size=kafka_settings.batch_size,
+            compression_type=kafka_settings.compression_type,
+            acks=kafka_settings.acks,
+            request_timeout_ms=max(kafka_settings.max_block_ms, 1000),
+        )
+        try:
+            await producer.start()
+        except KafkaError:
+            await producer.stop()
+            raise
+        return producer
+
+    async def _replay(self, records: list[SpooledRecord]) -> bool:
+        try:
+            if self._producer is None:
+                await self._connect()
+            futures = [
+                await self._producer.send(
+                    record.topic,
+                    value=record.value,
+                    key=record.key,
+                    headers=record.headers or None,
+                )
+                for record in records
+            ]
+            await asyncio.wait_for(
+                asyncio.gather(*futures), timeout=kafka_settings.flush_timeout
+            )
+        except (KafkaError, asyncio.TimeoutError) as e:
+            logger.warning(f"Failed to replay spooled messages: {e}")
+            return False
+        self._circuit.succeed()
+        return True
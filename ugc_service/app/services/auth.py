@@ -0,0 +1,98 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+
+from app.core.config import app_settings
+
+JWT_ALGORITHMS = ["HS256"]
+
+
+class InvalidTokenError(Exception):
+    """The access token is malformed, expired or not an access token."""
+
+
+class TokenCache:
+    """Bounded LRU of verified token identities keyed by the token hash.
+
+    An entry lives until the token's ``exp`` (capped at ``max_ttl`` seconds) and
+    the whole cache is dropped when the secret key changes, so a cached identity
+    is never served for a token the current key would reject.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._secret = app_settings.jwt_secret_key
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str) -> str | None:
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            if self._secret != app_settings.jwt_secret_key:
+                self._secret = app_settings.jwt_secret_key
+                self._entries.clear()
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token: str, identity: str, expires_at: float | None) -> None:
+        ttl_limit = time.time() + self.max_ttl
+        expires_at = min(expires_at, ttl_limit) if expires_at else ttl_limit
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (identity, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache(app_settings.jwt_cache_size, app_settings.jwt_cache_max_ttl)
+
+
+def get_token_identity(token: str) -> str:
+    """Verifies an access token and returns its subject.
+
+    Checks the same things ``flask_jwt_extended`` did for the WSGI app, so both
+    entry points accept the same tokens. Verified tokens are cached, so repeated
+    requests with the same token skip the signature check.
+    """
+    identity = token_cache.get(token)
+    if identity is not None:
+        return identity
+    try:
+        claims = jwt.decode(
+            token, app_settings.jwt_secret_key, algorithms=JWT_ALGORITHMS
+        )
+    except jwt.PyJWTError as e:
+        raise InvalidTokenError(str(e))
+    if claims.get("type") == "refresh" or "sub" not in claims:
+        raise InvalidTokenError("Only access tokens are allowed")
+    token_cache.set(token, claims["sub"], claims.get("exp"))
+    return claims["sub"]
+
+
+def get_bearer_token(authorization: str | None) -> str | None:
+    """Extracts the token from an ``Authorization: Bearer <token>`` header."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip()
@@ -0,0 +1,81 @@
+import json
+from json import JSONDecodeError
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.services.event_registry import EventRoute, event_registry
+from app.services.rate_limiter import EventSampler
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+
+BatchMessage = tuple[str, bytes, str | None]
+
+
+def parse_events_batch(body: bytes, mimetype: str) -> list[Any]:
+    """Splits a JSON array or an NDJSON body into raw events.
+
+    NDJSON lines that are not valid JSON are returned as ``None`` so that they
+    can be rejected individually instead of failing the whole batch.
+    """
+    if mimetype in NDJSON_MIMETYPES:
+        events = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except JSONDecodeError:
+                events.append(None)
+        return events
+
+    events = json.loads(body)
+    if not isinstance(events, list):
+        raise JSONDecodeError("Expected a JSON array of events", str(events), 0)
+    return events
+
+
+def validate_batch_event(
+    raw_event: Any, user_id: str | None
+) -> tuple[BaseModel, EventRoute]:
+    """Validates a raw batch event and returns it with its route."""
+    if not isinstance(raw_event, dict):
+        raise ValueError("Event must be a JSON object")
+    event_data = dict(raw_event)
+    route = event_registry.get(event_data.pop("type", None))
+    if route is None:
+        raise ValueError(f"Unknown event type: {raw_event.get('type')}")
+    return route.validate_python(event_data, user_id), route
+
+
+def prepare_batch(
+    raw_events: list[Any], user_id: str | None, sampler: EventSampler
+) -> tuple[list[dict], list[BatchMessage]]:
+    """Validates and samples a batch.
+
+    Returns the per-item statuses and the (topic, value, key) records to produce.
+    """
+    results = []
+    messages = []
+    for index, raw_event in enumerate(raw_events):
+        try:
+            event, route = validate_batch_event(raw_event, user_id)
+        except (ValidationError, ValueError, TypeError) as e:
+            results.append({"index": index, "status": "rejected", "error": str(e)})
+            continue
+        if not sampler.keep(route.name):
+            results.append({"index": index, "status": "sampled"})
+            continue
+        messages.append((route.topic, route.serialize(event), route.key(event)))
+        results.append({"index": index, "status": "accepted"})
+    return results, messages
+
+
+def batch_summary(results: list[dict]) -> dict:
+    """Builds the batch response; sampled events count as accepted."""
+    rejected = sum(result["status"] == "rejected" for result in results)
+    return {
+        "accepted": len(results) - rejected,
+        "rejected": rejected,
+        "results": results,
+    }
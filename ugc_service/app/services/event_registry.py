@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.core.config import kafka_settings
+from app.schemas.bookmark import Bookmark
+from app.schemas.click import Click
+from app.schemas.comment import Comment
+from app.schemas.like import Like
+from app.schemas.movie_filter_request import MovieFilterRequest
+from app.schemas.movie_player_change import MoviePlayerChange
+from app.schemas.movie_watch_time import MovieWatchTime
+from app.services.serializers import event_serializer
+
+
+def user_key(event: BaseModel) -> str | None:
+    """Partitions events by the user who produced them.
+
+    Anonymous events get no key by default, so the partitioner spreads them
+    over all partitions instead of hashing them all to the same one;
+    ``KAFKA_ANONYMOUS_KEY=fixed`` restores the shared "Anonymous" key.
+    """
+    if event.user_id:
+        return str(event.user_id)
+    return "Anonymous" if kafka_settings.anonymous_key == "fixed" else None
+
+
+def as_user_id(user_id: str | UUID | None) -> UUID | str | None:
+    """Converts the JWT subject to the UUID the schemas declare.
+
+    Non-UUID subjects are kept as they are, as before the conversion existed.
+    """
+    if user_id is None or isinstance(user_id, UUID):
+        return user_id
+    try:
+        return UUID(user_id)
+    except ValueError:
+        return user_id
+
+
+@dataclass
+class EventRoute:
+    """Describes how an event type is validated, serialized and routed to Kafka.
+
+    The pydantic core validator and serializer of the schema are looked up once,
+    so the request path does not go through ``BaseModel`` class-level dispatch.
+    """
+
+    name: str
+    path: str
+    schema: type[BaseModel]
+    topic: str
+    description: str
+    key_func: Callable[[BaseModel], str | None] = user_key
+    _validator: Any = field(init=False, repr=False)
+    _serializer: Any = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._validator = self.schema.__pydantic_validator__
+        self._serializer = self.schema.__pydantic_serializer__
+
+    def validate_json(self, data: bytes | str, user_id: str | None) -> BaseModel:
+        """Parses and validates a raw JSON body in one pass."""
+        event = self._validator.validate_json(data)
+        event.user_id = as_user_id(user_id)
+        return event
+
+    def validate_python(self, data: dict, user_id: str | None) -> BaseModel:
+        """Validates an already decoded event."""
+        event = self._validator.validate_python(data)
+        event.user_id = as_user_id(user_id)
+        return event
+
+    def serialize(self, event: BaseModel) -> bytes:
+        """Encodes the event with the configured Kafka value format."""
+        return event_serializer.dumps(self._serializer, event)
+
+    def key(self, event: BaseModel) -> str | None:
+        return self.key_func(event)
+
+
+event_registry: dict[str, EventRoute] = {}
+
+
+def register_event(route: EventRoute) -> EventRoute:
+    """Adds an event type to the registry; its API route is generated from it."""
+    if route.name in event_registry:
+        raise ValueError(f"Event type {route.name} is already registered")
+    event_registry[route.name] = route
+    return route
+
+
+register_event(
+    EventRoute(
+        name="movie_watch_time",
+        path="/movie-watch-time",
+        schema=MovieWatchTime,
+        topic=kafka_settings.movie_watch_times_topic,
+        description="Sends movie timestamp to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="click",
+        path="/click",
+        schema=Click,
+        topic=kafka_settings.clicks_topic,
+        description="Sends user's click to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="like",
+        path="/like",
+        schema=Like,
+        topic=kafka_settings.likes_topic,
+        description="Sends user's like information to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="comment",
+        path="/comment",
+        schema=Comment,
+        topic=kafka_settings.comments_topic,
+        description="Sends user's comment to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="bookmark",
+        path="/bookmark",
+        schema=Bookmark,
+        topic=kafka_settings.bookmarks_topic,
+        description="Sends user's bookmark to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="movie_filter_request",
+        path="/movie-filter-request",
+        schema=MovieFilterRequest,
+        topic=kafka_settings.movie_filter_requests_topic,
+        description="Sends user's movie filter request to Kafka.",
+    )
+)
+register_event(
+    EventRoute(
+        name="movie_player_change",
+        path="/movie-player-change",
+        schema=MoviePlayerChange,
+        topic=kafka_settings.movie_player_changes_topic,
+        description="Sends user's movie language change request.",
+    )
+)
@@ -1,22 +1,223 @@
+import atexit
+import logging
+import time
+from typing import Callable
+
 from kafka3 import KafkaProducer
+from kafka3.errors import KafkaError
+from kafka3.producer.future import FutureRecordMetadata, RecordMetadata
+
+from app.core.config import kafka_settings, spool_settings
+from app.services.spool import EventSpool, SpooledRecord, SpoolDrainer
+
+logger = logging.getLogger(__name__)
+
+DeliveryErrorCallback = Callable[[str, bytes, bytes | None, Exception], None]
+
+
+class CircuitBreaker:
+    """Skips Kafka for ``open_interval`` seconds after it failed.
 
-from app.core.config import kafka_settings
+    Once the interval is over, the next call is let through as a probe and the
+    circuit stays open for the others; a success closes it, a failure opens it
+    for another interval.
+    """
+
+    def __init__(self, open_interval: float):
+        self.open_interval = open_interval
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        if not self._open_until:
+            return True
+        now = time.monotonic()
+        if now < self._open_until:
+            return False
+        self._open_until = now + self.open_interval
+        return True
+
+    def succeed(self) -> None:
+        if self._open_until:
+            logger.info("Kafka is reachable again, closing the circuit")
+        self._open_until = 0.0
+
+    def fail(self) -> None:
+        if not self._open_until:
+            logger.warning(
+                f"Kafka is unreachable, spooling for {self.open_interval}s "
+                "before trying again"
+            )
+        self._open_until = time.monotonic() + self.open_interval
 
 
 class KafkaProducerService:
-    """A class for interacting with Apache Kafka for producing messages."""
+    """A class for interacting with Apache Kafka for producing messages.
+
+    Messages are sent asynchronously: ``produce_message`` only appends the record
+    to the producer's buffer, and the background sender thread batches records
+    according to ``linger_ms``, ``batch_size`` and ``compression_type``.
+    Delivery results are reported through callbacks, and the buffer is flushed
+    when the worker process exits.
 
-    def __init__(self, bootstrap_servers=kafka_settings.bootstrap_servers.split(",")):
-        """Initializes an instance with specified library version."""
-        self._producer = KafkaProducer(
-            bootstrap_servers=bootstrap_servers, api_version=(2, 0, 2)
+    With a spool, records that cannot be buffered (the buffer is full or the
+    brokers are unreachable for ``max_block_ms``) or that fail delivery are
+    written to disk and replayed by a background drainer once Kafka recovers.
+    Such a failure also opens a circuit breaker: for the next
+    ``circuit_open_interval`` seconds records go straight to the spool instead
+    of blocking requests for ``max_block_ms`` each.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers=kafka_settings.bootstrap_servers.split(","),
+        on_delivery_error: DeliveryErrorCallback | None = None,
+        sync_send: bool = kafka_settings.sync_send,
+        headers: list[tuple[str, bytes]] | None = None,
+        spool: EventSpool | None = None,
+        producer: KafkaProducer | None = None,
+    ):
+        """Initializes an instance with specified library version.
+
+        Args:
+            bootstrap_servers: Kafka brokers to connect to.
+            on_delivery_error: Called with topic, value, key and the exception
+                when a record could not be delivered.
+            sync_send: Flush after every message (the old blocking behaviour).
+            headers: Headers attached to every record, e.g. the value format.
+            spool: Disk spool for records that could not be sent.
+            producer: Ready client to use instead of connecting to
+                ``bootstrap_servers`` (e.g. an in-memory one for benchmarks).
+        """
+        self._producer = producer or KafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            api_version=(2, 0, 2),
+            linger_ms=kafka_settings.linger_ms,
+            batch_size=kafka_settings.batch_size,
+            compression_type=kafka_settings.compression_type,
+            acks=kafka_settings.acks,
+            max_block_ms=kafka_settings.max_block_ms,
         )
+        self._on_delivery_error = on_delivery_error
+        self._sync_send = sync_send
+        self._headers = headers
+        self._closed = False
+        self.spool = spool
+        self._circuit = CircuitBreaker(spool_settings.circuit_open_interval)
+        self._drainer = None
+        if spool is not None:
+            self._drainer = SpoolDrainer(
+                spool,
+                self._replay,
+                drain_rate=spool_settings.drain_rate,
+                chunk_size=spool_settings.drain_chunk_size,
+                retry_interval=spool_settings.retry_interval,
+            )
+            self._drainer.start()
+        atexit.register(self.close)
+
+    def produce_message(
+        self, topic: str, message: str | bytes, key: str | None = None
+    ) -> FutureRecordMetadata | None:
+        """Produces a message to the specified Kafka topic without waiting for the broker.
+
+        Returns None if the message was spooled instead of being buffered.
+        """
+        future = self._send(topic, message, key)
+        if self._sync_send:
+            self._producer.flush()
+        return future
+
+    def produce_messages(
+        self, messages: list[tuple[str, str | bytes, str | None]]
+    ) -> list[FutureRecordMetadata | None]:
+        """Produces a batch of (topic, message, key) records with a single flush at most."""
+        futures = [self._send(topic, message, key) for topic, message, key in messages]
+        if self._sync_send and futures:
+            self._producer.flush()
+        return futures
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Blocks until all buffered messages are delivered or the timeout expires."""
+        self._producer.flush(timeout=timeout)
 
-    def produce_message(self, topic: str, message: str, key: str | None = None) -> None:
-        """Produces a message to the specified Kafka topic."""
-        self._producer.send(
-            topic=topic,
-            value=message.encode("utf-8"),
-            key=key.encode("utf-8") if key else None,
+    def close(self) -> None:
+        """Flushes pending messages and closes the producer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._drainer is not None:
+            self._drainer.stop()
+        try:
+            self._producer.flush(timeout=kafka_settings.flush_timeout)
+        except Exception as e:
+            logger.error(f"Error while flushing Kafka producer: {e}")
+        self._producer.close(timeout=kafka_settings.flush_timeout)
+        if self.spool is not None:
+            self.spool.close()
+
+    def _send(
+        self, topic: str, message: str | bytes, key: str | None
+    ) -> FutureRecordMetadata | None:
+        value = message.encode("utf-8") if isinstance(message, str) else message
+        encoded_key = key.encode("utf-8") if key else None
+        if self.spool is not None and not self._circuit.allow():
+            self._spool(topic, value, encoded_key)
+            return None
+        try:
+            future = self._producer.send(
+                topic=topic, value=value, key=encoded_key, headers=self._headers
+            )
+        except KafkaError as e:
+            if self.spool is None:
+                raise
+            logger.warning(f"Spooling message to {topic}: {e}")
+            self._circuit.fail()
+            self._spool(topic, value, encoded_key)
+            return None
+        self._circuit.succeed()
+        future.add_callback(self._on_send_success)
+        future.add_errback(self._on_send_error, topic, value, encoded_key)
+        return future
+
+    @staticmethod
+    def _on_send_success(record_metadata: RecordMetadata) -> None:
+        logger.debug(
+            f"Delivered message to {record_metadata.topic}"
+            f"[{record_metadata.partition}]@{record_metadata.offset}"
         )
-        self._producer.flush()  # TODO: delete this
+
+    def _on_send_error(
+        self, topic: str, value: bytes, key: bytes | None, exc: Exception
+    ) -> None:
+        logger.error(f"Failed to deliver message to {topic}: {exc}")
+        if self.spool is not None:
+            self._circuit.fail()
+            self._spool(topic, value, key)
+        if self._on_delivery_error:
+            self._on_delivery_error(topic, value, key, exc)
+
+    def _spool(self, topic: str, value: bytes, key: bytes | None) -> None:
+        record = SpooledRecord(topic, value, key, self._headers or [])
+        if not self.spool.append(record):
+            logger.error(f"Spool is full, dropping message to {topic}")
+
+    def _replay(self, records: list[SpooledRecord]) -> bool:
+        """Sends spooled records and waits until all of them are acknowledged."""
+        try:
+            futures = [
+                self._producer.send(
+                    topic=record.topic,
+                    value=record.value,
+                    key=record.key,
+                    headers=record.headers or None,
+                )
+                for record in records
+            ]
+            self._producer.flush(timeout=kafka_settings.flush_timeout)
+        except KafkaError as e:
+            logger.warning(f"Failed to replay spooled messages: {e}")
+            return False
+        if not all(future.succeeded() for future in futures):
+            return False
+        self._circuit.succeed()
+        return True
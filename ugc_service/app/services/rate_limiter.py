@@ -0,0 +1,123 @@
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import app_settings, rate_limit_settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / refill_rate * 1000))
+return allowed
+"""
+
+
+class RateLimiter(ABC):
+    """Token bucket limiter keyed by client (user id or IP address)."""
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+
+    @abstractmethod
+    def allow(self, key: str, cost: int = 1) -> bool:
+        """Takes ``cost`` tokens from the client's bucket if it has enough."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Per-process buckets; the least recently seen clients are evicted first."""
+
+    def __init__(self, capacity: int, refill_rate: float, max_keys: int):
+        super().__init__(capacity, refill_rate)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, cost: int = 1) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class RedisRateLimiter(RateLimiter):
+    """Buckets shared by all workers; fails open when Redis is unavailable."""
+
+    def __init__(self, capacity: int, refill_rate: float, redis: Redis):
+        super().__init__(capacity, refill_rate)
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def allow(self, key: str, cost: int = 1) -> bool:
+        try:
+            return bool(
+                self._script(
+                    keys=[f"ugc:rate_limit:{key}"],
+                    args=[self.capacity, self.refill_rate, time.time(), cost],
+                )
+            )
+        except RedisError as e:
+            logger.error(f"Rate limiter is unavailable: {e}")
+            return True
+
+
+class EventSampler:
+    """Keeps one in N events of the types listed in ``sampling``."""
+
+    def __init__(self, sampling: dict[str, int]):
+        self.probabilities = {
+            event_type: 1 / rate for event_type, rate in sampling.items() if rate > 1
+        }
+
+    def keep(self, event_type: str) -> bool:
+        probability = self.probabilities.get(event_type)
+        return probability is None or random.random() < probability
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Builds the limiter configured with the ``RATE_LIMIT_*`` settings."""
+    if not rate_limit_settings.enabled:
+        return None
+    if rate_limit_settings.capacity < app_settings.batch_max_events:
+        raise ValueError(
+            f"RATE_LIMIT_CAPACITY ({rate_limit_settings.capacity}) is less than "
+            f"APP_BATCH_MAX_EVENTS ({app_settings.batch_max_events}), "
+            "a full batch could never be paid for"
+        )
+    if rate_limit_settings.backend == "redis":
+        return RedisRateLimiter(
+            rate_limit_settings.capacity,
+            rate_limit_settings.refill_rate,
+            Redis.from_url(rate_limit_settings.redis_url),
+        )
+    return MemoryRateLimiter(
+        rate_limit_settings.capacity,
+        rate_limit_settings.refill_rate,
+        rate_limit_settings.max_keys,
+    )
@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+
+import msgpack
+import orjson
+from pydantic import BaseModel
+from pydantic_core import SchemaSerializer
+
+from app.core.config import kafka_settings
+
+FORMAT_HEADER = "ugc-format"
+
+
+class EventSerializer(ABC):
+    """Turns a validated event into the Kafka record value.
+
+    ``format`` is sent in the ``ugc-format`` record header so that consumers
+    can pick the matching decoder and tell wire format versions apart.
+    ``dumps`` receives the schema's pydantic-core serializer, which event
+    routes look up once per event type.
+    """
+
+    format: str
+
+    @property
+    def headers(self) -> list[tuple[str, bytes]]:
+        return [(FORMAT_HEADER, self.format.encode("utf-8"))]
+
+    @abstractmethod
+    def dumps(self, serializer: SchemaSerializer, event: BaseModel) -> bytes:
+        pass
+
+
+class JSONSerializer(EventSerializer):
+    """JSON produced directly by the pydantic-core serializer of the schema."""
+
+    format = "json.v1"
+
+    def dumps(self, serializer: SchemaSerializer, event: BaseModel) -> bytes:
+        return serializer.to_json(event)
+
+
+class ORJSONSerializer(EventSerializer):
+    """JSON produced by orjson, which encodes UUID and datetime natively."""
+
+    format = "json.v1"
+
+    def dumps(self, serializer: SchemaSerializer, event: BaseModel) -> bytes:
+        return orjson.dumps(serializer.to_python(event))
+
+
+class MsgpackSerializer(EventSerializer):
+    """Compact binary encoding with the same field layout as JSON."""
+
+    format = "msgpack.v1"
+
+    def dumps(self, serializer: SchemaSerializer, event: BaseModel) -> bytes:
+        return msgpack.packb(serializer.to_python(event, mode="json"))
+
+
+serializers: dict[str, type[EventSerializer]] = {
+    "json": JSONSerializer,
+    "orjson": ORJSONSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str = kafka_settings.value_format) -> EventSerializer:
+    """Returns the serializer configured with ``KAFKA_VALUE_FORMAT``."""
+    try:
+        return serializers[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown Kafka value format {name}, expected one of {list(serializers)}"
+        )
+
+
+event_serializer = get_serializer()
@@ -0,0 +1,312 @@
+import fcntl
+import io
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from itertools import count
+from typing import BinaryIO, Callable, Iterator
+
+from app.core.config import spool_settings
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct(">HHIH")
+HEADER_HEADER = struct.Struct(">HH")
+SEGMENT_SUFFIX = ".spool"
+READ_BUFFER = 1024**2
+
+
+@dataclass
+class SpooledRecord:
+    topic: str
+    value: bytes
+    key: bytes | None
+    headers: list[tuple[str, bytes]]
+
+
+def encode_record(record: SpooledRecord) -> bytes:
+    topic = record.topic.encode("utf-8")
+    key = record.key or b""
+    parts = [
+        RECORD_HEADER.pack(
+            len(topic), len(key), len(record.value), len(record.headers)
+        ),
+        topic,
+        key,
+        record.value,
+    ]
+    for header_key, header_value in record.headers:
+        encoded_key = header_key.encode("utf-8")
+        parts += [
+            HEADER_HEADER.pack(len(encoded_key), len(header_value)),
+            encoded_key,
+            header_value,
+        ]
+    return b"".join(parts)
+
+
+def read_record(stream: BinaryIO) -> SpooledRecord | None:
+    """Reads the next record; None at the end, or at a record truncated by a crash."""
+    header = stream.read(RECORD_HEADER.size)
+    if not header:
+        return None
+    try:
+        topic_len, key_len, value_len, headers_count = RECORD_HEADER.unpack(header)
+        topic = read_exactly(stream, topic_len).decode("utf-8")
+        key = read_exactly(stream, key_len) or None
+        value = read_exactly(stream, value_len)
+        headers = []
+        for _ in range(headers_count):
+            header_key_len, header_value_len = HEADER_HEADER.unpack(
+                read_exactly(stream, HEADER_HEADER.size)
+            )
+            header_key = read_exactly(stream, header_key_len).decode("utf-8")
+            headers.append((header_key, read_exactly(stream, header_value_len)))
+    except (struct.error, EOFError):
+        logger.error("Truncated record at the end of a spool segment")
+        return None
+    return SpooledRecord(topic, value, key, headers)
+
+
+def read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
+
+
+def decode_records(data: bytes) -> list[SpooledRecord]:
+    """Decodes a segment; a record truncated by a crash ends the segment."""
+    stream = io.BytesIO(data)
+    records = []
+    while (record := read_record(stream)) is not None:
+        records.append(record)
+    return records
+
+
+class EventSpool:
+    """Bounded append-only on-disk queue of Kafka records.
+
+    Records are appended to the active segment file and fsynced at most once per
+    ``fsync_interval``; segments are rotated at ``segment_bytes`` and removed once
+    they have been replayed. Every process takes an exclusive ``worker-N``
+    directory, so gunicorn workers never share segments and a restarted worker
+    picks up what its predecessor left behind.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        segment_bytes: int,
+        fsync_interval: float,
+    ):
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.directory = self._acquire_directory(path)
+        self.spooled = 0
+        self.dropped = 0
+        self.drained = 0
+        self.drain_rate = 0.0
+        self._lock = threading.Lock()
+        self._segments = sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        self._size = sum(os.path.getsize(segment) for segment in self._segments)
+        self._next_segment = (
+            self._segment_number(self._segments[-1]) + 1 if self._segments else 0
+        )
+        self._active = None
+        self._active_size = 0
+        self._last_fsync = time.monotonic()
+
+    def append(self, record: SpooledRecord) -> bool:
+        """Appends a record; returns False if the spool is full and it was dropped."""
+        data = encode_record(record)
+        with self._lock:
+            if self._size + len(data) > self.max_bytes:
+                self.dropped += 1
+                return False
+            if (
+                self._active is None
+                or self._active_size + len(data) > self.segment_bytes
+            ):
+                self._open_segment()
+            self._active.write(data)
+            self._active.flush()
+            self._active_size += len(data)
+            self._size += len(data)
+            self.spooled += 1
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fsync()
+        return True
+
+    def sync(self) -> None:
+        """Fsyncs the active segment if it has unsynced writes."""
+        with self._lock:
+            if self._active is not None:
+                self._fsync()
+
+    def oldest_segment(self) -> str | None:
+        """Returns the oldest segment to replay, sealing the active one if needed."""
+        with self._lock:
+            if not self._segments:
+                return None
+            if self._active is not None and self._segments[0] == self._active.name:
+                self._close_active()
+            return self._segments[0]
+
+    @staticmethod
+    def read_segment(segment: str, chunk_size: int) -> Iterator[list[SpooledRecord]]:
+        """Reads a segment in chunks of records, without loading it whole."""
+        with open(segment, "rb", buffering=READ_BUFFER) as segment_file:
+            chunk = []
+            while (record := read_record(segment_file)) is not None:
+                chunk.append(record)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    def remove_segment(self, segment: str, records_count: int) -> None:
+        with self._lock:
+            self._size -= os.path.getsize(segment)
+            os.remove(segment)
+            self._segments.remove(segment)
+            self.drained += records_count
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "spool_bytes": self._size,
+                "spool_segments": len(self._segments),
+                "spooled_total": self.spooled,
+                "dropped_total": self.dropped,
+                "drained_total": self.drained,
+                "drain_rate": self.drain_rate,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._close_active()
+
+    def _open_segment(self) -> None:
+        if self._active is not None:
+            self._close_active()
+        segment = os.path.join(
+            self.directory, f"{self._next_segment:020d}{SEGMENT_SUFFIX}"
+        )
+        self._next_segment += 1
+        self._active = open(segment, "ab")
+        self._active_size = 0
+        self._segments.append(segment)
+
+    def _close_active(self) -> None:
+        self._fsync()
+        self._active.close()
+        self._active = None
+
+    def _fsync(self) -> None:
+        os.fsync(self._active.fileno())
+        self._last_fsync = time.monotonic()
+
+    @staticmethod
+    def _segment_number(segment: str) -> int:
+        return int(os.path.basename(segment).removesuffix(SEGMENT_SUFFIX))
+
+    def _acquire_directory(self, path: str) -> str:
+        for number in count():
+            directory = os.path.join(path, f"worker-{number}")
+            os.makedirs(directory, exist_ok=True)
+            lock_file = open(os.path.join(directory, ".lock"), "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            self._lock_file = lock_file
+            return directory
+
+
+class SpoolDrainer(threading.Thread):
+    """Replays spooled records into Kafka in append order.
+
+    ``replay`` sends a chunk of records and returns True once all of them are
+    acknowledged; on failure the same chunk is retried after ``retry_interval``,
+    so delivery is at-least-once. ``drain_rate`` caps records per second (0 means
+    unlimited) so that recovery does not starve live traffic.
+    """
+
+    def __init__(
+        self,
+        spool: EventSpool,
+        replay: Callable[[list[SpooledRecord]], bool],
+        drain_rate: int,
+        chunk_size: int,
+        retry_interval: float,
+    ):
+        super().__init__(name="ugc-spool-drainer", daemon=True)
+        self.spool = spool
+        self.replay = replay
+        self.drain_rate = drain_rate
+        self.chunk_size = chunk_size
+        self.retry_interval = retry_interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            segment = self.spool.oldest_segment()
+            if segment is None:
+                self.spool.drain_rate = 0.0
+                self._stopped.wait(self.spool.fsync_interval)
+                continue
+            drained = 0
+            for chunk in self.spool.read_segment(segment, self.chunk_size):
+                if not self._drain(chunk):
+                    break
+                drained += len(chunk)
+            else:
+                self.spool.remove_segment(segment, drained)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _drain(self, chunk: list[SpooledRecord]) -> bool:
+        """Replays a chunk until it is acknowledged; False if stopped meanwhile."""
+        while True:
+            if self._stopped.is_set():
+                return False
+            started = time.monotonic()
+            if self.replay(chunk):
+                break
+            logger.warning("Kafka is unavailable, retrying spooled records later")
+            self.spool.drain_rate = 0.0
+            self.spool.sync()
+            self._stopped.wait(self.retry_interval)
+        elapsed = time.monotonic() - started
+        if self.drain_rate:
+            pause = len(chunk) / self.drain_rate - elapsed
+            if pause > 0:
+                self._stopped.wait(pause)
+        self.spool.drain_rate = len(chunk) / max(time.monotonic() - started, 1e-6)
+        return True
+
+
+def get_event_spool() -> EventSpool | None:
+    """Builds the spool configured with the ``SPOOL_*`` settings."""
+    if not spool_settings.enabled:
+        return None
+    return EventSpool(
+        spool_settings.path,
+        max_bytes=spool_settings.max_bytes,
+        segment_bytes=spool_settings.segment_bytes,
+        fsync_interval=spool_settings.fsync_interval,
+    )
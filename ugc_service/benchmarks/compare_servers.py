@@ -0,0 +1,88 @@
+"""Side-by-side throughput of the gevent (WSGI) and the ASGI deployments.
+
+Both servers are started with gunicorn on the same number of workers and
+produce to the Kafka brokers from ``.env``; then the same event mix is sent to
+each of them. Run from the ``ugc_service`` directory::
+
+    python -m benchmarks.compare_servers --workers 4 --concurrency 64 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.load import run_load, wait_for_port
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+WORKER_CLASSES = {
+    "gevent": ("gevent", "app.wsgi_app:app"),
+    "asgi": ("uvicorn.workers.UvicornWorker", "app.asgi_app:app"),
+}
+
+
+def start_server(name: str, port: int, workers: int) -> subprocess.Popen:
+    worker_class, application = WORKER_CLASSES[name]
+    env = os.environ | {
+        "PYTHONPATH": os.pathsep.join([str(SERVICE_DIR), str(SERVICE_DIR / "app")]),
+        "RATE_LIMIT_ENABLED": "false",
+        "SPOOL_PATH": f"/tmp/ugc-benchmark-spool-{name}",
+        "APP_LOG_PATH": f"/tmp/ugc-benchmark-{name}.log",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-k",
+            worker_class,
+            "-w",
+            str(workers),
+            "-b",
+            f"127.0.0.1:{port}",
+            application,
+        ],
+        cwd=SERVICE_DIR,
+        env=env,
+    )
+
+
+async def benchmark(name: str, port: int, args: argparse.Namespace) -> dict:
+    server = start_server(name, port, args.workers)
+    try:
+        await wait_for_port("127.0.0.1", port, timeout=30)
+        await run_load("127.0.0.1", port, args.warmup, args.concurrency)
+        result = await run_load("127.0.0.1", port, args.duration, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+    summary = result.summary()
+    summary["requests_per_sec_per_worker"] = summary["requests_per_sec"] / args.workers
+    return summary
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    for offset, name in enumerate(WORKER_CLASSES):
+        results[name] = await benchmark(name, args.port + offset, args)
+    report = json.dumps(
+        {"config": vars(args) | {"output": None}, "results": results}, indent=2
+    )
+    if args.output:
+        Path(args.output).write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    asyncio.run(main(parser.parse_args()))
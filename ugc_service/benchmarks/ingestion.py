@@ -0,0 +1,222 @@
+"""In-process ingestion benchmark of the UGC events API.
+
+Drives every ``/events/*`` endpoint of the Flask app with the weighted event
+mix from ``benchmarks.load`` through the WSGI test client, with Kafka replaced
+by an in-memory producer, so the numbers cover exactly our code: routing, JWT,
+validation, serialization, logging and ``KafkaProducerService``. Run from the
+``ugc_service`` directory::
+
+    python -m benchmarks.ingestion --requests 20000 --output benchmarks/results/ingestion.json
+    python -m benchmarks.ingestion --baseline benchmarks/results/ingestion.json
+
+With ``--baseline`` the run fails if throughput drops or p95 latency grows by
+more than ``--tolerance`` compared with a saved report.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.load import event_mix, percentile
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+BENCHMARK_ENV = {
+    "KAFKA_BOOTSTRAP_SERVERS": "localhost:9094",
+    "KAFKA_LIKES_TOPIC": "likes",
+    "KAFKA_COMMENTS_TOPIC": "comments",
+    "KAFKA_CLICKS_TOPIC": "clicks",
+    "KAFKA_BOOKMARKS_TOPIC": "bookmarks",
+    "KAFKA_MOVIE_FILTER_REQUESTS_TOPIC": "movie_filter_requests",
+    "KAFKA_MOVIE_PLAYER_CHANGES_TOPIC": "movie_player_changes_topic",
+    "KAFKA_MOVIE_WATCH_TIMES_TOPIC": "movie_watch_times",
+    "SPOOL_ENABLED": "false",
+    "RATE_LIMIT_ENABLED": "false",
+}
+
+
+class DeliveredFuture:
+    """Already acknowledged send result, compatible with the kafka3 future API."""
+
+    def __init__(self, metadata: SimpleNamespace):
+        self.metadata = metadata
+
+    def add_callback(self, fn, *args, **kwargs):
+        fn(*args, self.metadata, **kwargs)
+        return self
+
+    def add_errback(self, fn, *args, **kwargs):
+        return self
+
+    def succeeded(self) -> bool:
+        return True
+
+
+class InMemoryProducer:
+    """Stand-in for ``kafka3.KafkaProducer`` that only counts records."""
+
+    def __init__(self):
+        self.records = 0
+        self.bytes = 0
+        self.per_topic: dict[str, int] = defaultdict(int)
+
+    def send(self, topic, value=None, key=None, headers=None):
+        self.records += 1
+        self.bytes += len(value or b"")
+        self.per_topic[topic] += 1
+        return DeliveredFuture(
+            SimpleNamespace(topic=topic, partition=0, offset=self.records)
+        )
+
+    def flush(self, timeout=None):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+
+def latency_stats(latencies: list[float]) -> dict[str, float]:
+    return {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    for name, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(name, value)
+    log_dir = tempfile.mkdtemp(prefix="ugc-benchmark-")
+    os.environ.setdefault("APP_LOG_PATH", os.path.join(log_dir, "ugc.log"))
+    sys.path[:0] = [str(SERVICE_DIR), str(SERVICE_DIR / "app")]
+
+    import jwt
+
+    from api.v1 import events
+    from app.core.config import app_settings
+    from app.main import app
+    from app.services.kafka import KafkaProducerService
+    from app.services.serializers import event_serializer
+
+    producer = InMemoryProducer()
+    events.kafka_producer_service = KafkaProducerService(
+        headers=event_serializer.headers, producer=producer
+    )
+
+    headers = {}
+    if not args.anonymous:
+        token = jwt.encode(
+            {"sub": str(uuid.uuid4()), "type": "access", "exp": time.time() + 3600},
+            app_settings.jwt_secret_key,
+            algorithm="HS256",
+        )
+        headers["Authorization"] = f"Bearer {token}"
+
+    client = app.test_client()
+    requests = itertools.cycle(event_mix())
+
+    def send(path: str, body: bytes) -> None:
+        response = client.post(
+            path, data=body, headers=headers, content_type="application/json"
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+
+    for path, body in itertools.islice(requests, args.warmup):
+        send(path, body)
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    started = time.perf_counter()
+    for path, body in itertools.islice(requests, args.requests):
+        request_started = time.perf_counter()
+        send(path, body)
+        latencies[path].append(time.perf_counter() - request_started)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    allocated = 0
+    peak = 0
+    for path, body in itertools.islice(requests, args.allocation_requests):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        send(path, body)
+        after, request_peak = tracemalloc.get_traced_memory()
+        allocated += max(after - before, 0)
+        peak += request_peak - before
+    tracemalloc.stop()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "anonymous": args.anonymous,
+            "value_format": os.environ.get("KAFKA_VALUE_FORMAT", "json"),
+        },
+        "overall": latency_stats(all_latencies)
+        | {
+            "events_per_sec_per_worker": args.requests / elapsed,
+            "retained_bytes_per_request": allocated / args.allocation_requests,
+            "peak_bytes_per_request": peak / args.allocation_requests,
+            "produced_bytes_per_event": producer.bytes / producer.records,
+        },
+        "endpoints": {
+            path: latency_stats(values) for path, values in sorted(latencies.items())
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lists the overall metrics that regressed by more than ``tolerance``."""
+    current, previous = report["overall"], baseline["overall"]
+    regressions = []
+    if current["events_per_sec_per_worker"] < previous["events_per_sec_per_worker"] * (
+        1 - tolerance
+    ):
+        regressions.append("events_per_sec_per_worker")
+    for metric in ("p95_ms", "p99_ms", "peak_bytes_per_request"):
+        if current[metric] > previous[metric] * (1 + tolerance):
+            regressions.append(metric)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--allocation-requests", type=int, default=1000)
+    parser.add_argument("--anonymous", action="store_true", help="Send no JWT")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a saved JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    report = run(args)
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(rendered + "\n")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            sys.exit(
+                f"Regressed compared with {args.baseline}: {', '.join(regressions)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import asyncio
+import itertools
+import json
+import statistics
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+def event_mix() -> list[tuple[str, bytes]]:
+    """A weighted mix of requests for all event endpoints.
+
+    Watch-time heartbeats dominate real traffic, followed by clicks.
+    """
+    movie_id = str(uuid.uuid4())
+    created_at = datetime.now(timezone.utc).isoformat()
+    payloads = [
+        (
+            "/events/movie-watch-time",
+            {
+                "movie_id": movie_id,
+                "seconds_amt": 120,
+                "total_seconds_amt": 5400,
+                "created_at": created_at,
+            },
+            10,
+        ),
+        ("/events/click", {"resource": "/films/top", "created_at": created_at}, 5),
+        ("/events/like", {"movie_id": movie_id, "created_at": created_at}, 1),
+        (
+            "/events/comment",
+            {"movie_id": movie_id, "content": "Great movie", "created_at": created_at},
+            1,
+        ),
+        ("/events/bookmark", {"movie_id": movie_id, "created_at": created_at}, 1),
+        (
+            "/events/movie-filter-request",
+            {"filters": json.dumps({"genre": "comedy", "rating": 8})},
+            1,
+        ),
+        (
+            "/events/movie-player-change",
+            {
+                "movie_id": movie_id,
+                "change_type": "quality",
+                "old_value": "720p",
+                "new_value": "1080p",
+            },
+            1,
+        ),
+    ]
+    return [
+        (path, json.dumps(payload).encode("utf-8"))
+        for path, payload, weight in payloads
+        for _ in range(weight)
+    ]
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+@dataclass
+class LoadResult:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict[str, float]:
+        """Latencies are reported in milliseconds."""
+        return {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "requests_per_sec": (
+                len(self.latencies) / self.elapsed if self.elapsed else 0
+            ),
+            "mean_ms": statistics.fmean(self.latencies) * 1000 if self.latencies else 0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+        }
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Reads one HTTP/1.1 response and returns its status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+    content_length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            content_length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif content_length:
+        await reader.readexactly(content_length)
+    return status
+
+
+async def run_connection(
+    host: str,
+    port: int,
+    requests,
+    result: LoadResult,
+    deadline: float,
+    headers: dict[str, str],
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    extra_headers = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    try:
+        for path, body in requests:
+            if time.perf_counter() >= deadline:
+                break
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\n{extra_headers}"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            if status >= 300:
+                result.errors += 1
+            else:
+                result.latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def run_load(
+    host: str,
+    port: int,
+    duration: float,
+    concurrency: int,
+    headers: dict[str, str] | None = None,
+) -> LoadResult:
+    """Sends the event mix over ``concurrency`` keep-alive connections."""
+    requests = itertools.cycle(event_mix())
+    result = LoadResult()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(
+                host, port, requests, result, started + duration, headers or {}
+            )
+            for _ in range(concurrency)
+        )
+    )
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def wait_for_port(host: str, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+            continue
+        writer.close()
+        return
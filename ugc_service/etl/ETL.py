@@ -1,42 +1,144 @@
 import os
 import sys
+import time
+from multiprocessing import Process
 
 sys.path.append(os.getcwd())
 
 from db.click import ClickDB
 from db.kafka import KafkaQuery
 from core.config import ETLSettings
-from service.other_service import get_data_other_service
+from core.logger import get_logger
+from kafka3 import ConsumerRebalanceListener
+from kafka3.errors import CommitFailedError
+from service.batcher import Batch
+from service.dead_letter import dead_letters
+from service.metrics import etl_metrics, serve_metrics
+from service.other_service import get_many_other_service
 
 settings = ETLSettings()
+logger = get_logger()
 
-topic = sys.argv[1]
 
+def kafka_parser(events: list[dict]) -> list[dict]:
+    """adding data from other services, one lookup per distinct id of the batch"""
+    movies = get_many_other_service(
+        settings.CONTENT_API, (values.get("movie_id") for values in events)
+    )
+    users = get_many_other_service(
+        settings.USER_API, (values.get("user_id") for values in events)
+    )
+    return [
+        values
+        | movies.get(str(values.get("movie_id")), {})
+        | users.get(str(values.get("user_id")), {})
+        for values in events
+    ]
 
-def kafka_parser(values):
-    """adding data from other services"""
-    movie = {}
-    user = {}
-    if "movie_id" in values.keys():
-        movie = get_data_other_service(settings.CONTENT_API, values["movie_id"])
-    if "user_id" in values.keys():
-        user = get_data_other_service(settings.USER_API, values["user_id"])
-    return values | movie | user
 
+def flush(consumer, click: ClickDB, table: str, batch: Batch, target=None):
+    """Inserts the batch and commits its offsets only if the insert succeeded.
 
-if __name__ == "__main__":
+    Rejected events go to the dead letters, which are stored before the commit;
+    if they can't be, the batch is rewound as if the insert failed. Returns
+    whether the batch was inserted and its dead letters stored.
+    """
+    started = time.perf_counter()
+    rows = kafka_parser(batch.events)
+    parsed = time.perf_counter()
+    inserted = click.insert(table, rows, on_reject=dead_letters.send, target=target)
+    etl_metrics.observe_batch(
+        table, len(rows), parsed - started, time.perf_counter() - parsed
+    )
+    if inserted and not dead_letters.flush():
+        logger.error(f"Dead letters of {len(rows)} {table} events not stored")
+        inserted = False
+    if inserted:
+        try:
+            consumer.commit(batch.commit_offsets())
+        except CommitFailedError as e:
+            logger.error(f"Offsets of {len(rows)} {table} events not committed: {e}")
+    else:
+        logger.error(f"Insert of {len(rows)} {table} events failed, retrying")
+        batch.rewind(consumer)
+    batch.clear()
+    return inserted
+
+
+class FlushOnRevoke(ConsumerRebalanceListener):
+    """Flushes pending batches before their partitions move to another worker."""
+
+    def __init__(self, click: ClickDB, batches: dict[str, Batch]):
+        self.click = click
+        self.batches = batches
+        self.consumer = None
+
+    def on_partitions_revoked(self, revoked):
+        for table, batch in self.batches.items():
+            if batch.events:
+                flush(self.consumer, self.click, table, batch)
+
+    def on_partitions_assigned(self, assigned):
+        pass
+
+
+def run(topics: list[str], group_id: str, worker: int = 0):
+    """Consumes ``topics`` and inserts every topic into the table of the same name."""
+    if settings.METRICS_PORT:
+        serve_metrics(settings.METRICS_PORT + worker)
     click = ClickDB()
-    kafka = KafkaQuery(topic)
-
-    consumer = kafka.get_consumer()
-    count = 0
-    batch = []
-    for messages in consumer:
-        data = kafka_parser(messages.value)
-        batch.append(data)
-        count += 1
-        if count == settings.BATCH_COUNT:
-            click.insert(topic, batch)
-            consumer.commit()
-            count = 0
-            batch = []
+    kafka = KafkaQuery(topics, group_id)
+    batches = {
+        topic: Batch(
+            settings.BATCH_COUNT, settings.BATCH_MAX_BYTES, settings.BATCH_LINGER
+        )
+        for topic in topics
+    }
+    listener = FlushOnRevoke(click, batches)
+    consumer = kafka.get_consumer(listener)
+    listener.consumer = consumer
+    while True:
+        records = consumer.poll(
+            timeout_ms=min(
+                batch.poll_timeout_ms(settings.POLL_TIMEOUT_MS)
+                for batch in batches.values()
+            ),
+            max_records=min(batch.remaining for batch in batches.values()),
+        )
+        for partition, partition_records in records.items():
+            batch = batches[partition.topic]
+            etl_metrics.observe_messages(partition.topic, len(partition_records))
+            for record in partition_records:
+                try:
+                    event = kafka.decode(record)
+                    if not isinstance(event, dict):
+                        raise ValueError(f"not an object: {event!r}")
+                except ValueError as e:
+                    dead_letters.send(
+                        partition.topic, {"value": record.value}, f"Undecodable: {e}"
+                    )
+                    batch.skip(record)
+                    continue
+                batch.add(event, record)
+        for table, batch in batches.items():
+            if batch.due():
+                flush(consumer, click, table, batch)
+        etl_metrics.report(consumer)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run([sys.argv[1]], group_id=sys.argv[1])
+    else:
+        # the one-topic mode consumes each topic in the group named after it
+        KafkaQuery(settings.TOPICS, settings.GROUP_ID).seed_offsets(
+            {topic: topic for topic in settings.TOPICS}
+        )
+        workers = [
+            Process(target=run, args=(settings.TOPICS, settings.GROUP_ID, worker))
+            for worker in range(settings.WORKERS)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
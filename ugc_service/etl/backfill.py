@@ -0,0 +1,303 @@
+"""Reprocesses the history of a topic into a shadow table and swaps it in.
+
+    python backfill.py run likes --from-timestamp 2024-01-01T00:00:00 --workers 4
+    python backfill.py run likes
+    python backfill.py swap likes
+
+``run`` reads the topic in its own ``<topic>_backfill`` consumer group, from a
+timestamp or offset (or, without one, from where the previous run stopped) up
+to the end offsets at start, with the partitions spread over worker processes.
+The events are enriched like the ETL does and written in large batches to
+``<table>_shadow``, a Distributed table over ``<table>_shadow_local`` with the
+layout of ``<table>_local``; a run with a start recreates them empty. To swap:
+stop the ETL, run ``run`` again without a start to catch up with the tail, then
+``swap`` exchanges ``<table>_local`` and ``<table>_shadow_local`` atomically on
+every node, rebuilding the views over the table from the shadow, and restart
+the ETL.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from multiprocessing import Process
+
+sys.path.append(os.getcwd())
+
+from ETL import flush
+from core.config import ETLSettings
+from core.logger import get_logger
+from data.schema import cluster_name, database_name
+from db.click import ClickDB
+from db.kafka import KafkaQuery
+from kafka3.structs import TopicPartition
+from service.batcher import Batch
+from service.dead_letter import dead_letters
+
+settings = ETLSettings()
+logger = get_logger()
+partitioned_layout = importlib.import_module("migrations.0002_partitioned_layout")
+engagement_views = importlib.import_module("migrations.0003_engagement_views")
+
+
+def run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+
+def create_distributed(click: ClickDB, name: str, local: str):
+    click.execute(
+        f"""CREATE TABLE IF NOT EXISTS {database_name}.{name}
+            ON CLUSTER {cluster_name} AS {database_name}.{local}
+            ENGINE = Distributed({cluster_name}, {database_name}, {local}, rand())
+            """
+    )
+
+
+def drop_tables(click: ClickDB, *names: str):
+    for name in names:
+        click.execute(
+            f"DROP TABLE IF EXISTS {database_name}.{name} ON CLUSTER {cluster_name} SYNC"
+        )
+
+
+def create_shadow(click: ClickDB, table: str, fresh: bool):
+    """Creates the shadow tables with the layout the migrations give the table.
+
+    A fresh run drops the previous shadow. Each shadow is replicated under its own
+    ZooKeeper path, named after the run, since after a swap the local table keeps
+    the path of the shadow it was created as.
+    """
+    shadow_local = f"{table}_shadow_local"
+    if fresh:
+        drop_tables(click, f"{table}_shadow", shadow_local)
+    columns, order_by, retention, _ = partitioned_layout.tables[table]
+    click.execute(
+        partitioned_layout.local_table_query(
+            shadow_local,
+            f"{shadow_local}_{run_id()}",
+            columns,
+            order_by,
+            retention,
+        )
+    )
+    create_distributed(click, f"{table}_shadow", shadow_local)
+
+
+def swap(click: ClickDB, table: str):
+    """Exchanges the shadow in, together with the views aggregating the table.
+
+    The backfilled rows never went through the materialized views, so the view
+    tables are rebuilt from the shadow first, under shadow names, and exchanged
+    with the table. The materialized views are dropped for the exchange and
+    recreated over the new local table.
+    """
+    views = {
+        name: spec for name, spec in engagement_views.views.items() if spec[0] == table
+    }
+    for view, (_, columns, order_by, select) in views.items():
+        drop_tables(click, f"{view}_shadow", f"{view}_shadow_local")
+        click.execute(
+            engagement_views.local_view_query(
+                f"{view}_shadow_local",
+                f"{view}_shadow_local_{run_id()}",
+                columns,
+                order_by,
+            )
+        )
+        create_distributed(click, f"{view}_shadow", f"{view}_shadow_local")
+        click.execute(
+            f"INSERT INTO {database_name}.{view}_shadow "
+            f"SELECT{select.format(source=f'{database_name}.{table}_shadow')}"
+        )
+    for view in views:
+        click.execute(
+            f"DROP VIEW IF EXISTS {database_name}.{view}_mv "
+            f"ON CLUSTER {cluster_name} SYNC"
+        )
+    for name in [table, *views]:
+        click.execute(
+            f"EXCHANGE TABLES {database_name}.{name}_local "
+            f"AND {database_name}.{name}_shadow_local ON CLUSTER {cluster_name}"
+        )
+    for view, (_, _, _, select) in views.items():
+        click.execute(engagement_views.materialized_view_query(view, table, select))
+    logger.info(
+        f"{table} now serves the backfilled rows; the previous ones are in "
+        f"{table}_shadow_local, drop {table}_shadow and {table}_shadow_local "
+        "once checked"
+    )
+    for view in views:
+        logger.info(
+            f"{view} is rebuilt from the backfilled rows; drop {view}_shadow and "
+            f"{view}_shadow_local once checked"
+        )
+
+
+def offset_ranges(consumer, partitions, args) -> dict[TopicPartition, tuple[int, int]]:
+    """Start and stop (exclusive) offsets of the partitions to reprocess."""
+    beginnings = consumer.beginning_offsets(partitions)
+    ends = consumer.end_offsets(partitions)
+
+    def at_time(timestamp: datetime | None, default: dict) -> dict:
+        if timestamp is None:
+            return default
+        found = consumer.offsets_for_times(
+            {partition: int(timestamp.timestamp() * 1000) for partition in partitions}
+        )
+        return {
+            partition: found[partition].offset if found[partition] else ends[partition]
+            for partition in partitions
+        }
+
+    stops = at_time(args.to_timestamp, ends)
+    starts = at_time(args.from_timestamp, {})
+    ranges = {}
+    for partition in partitions:
+        if args.from_offset is not None:
+            start = args.from_offset
+        elif partition in starts:
+            start = starts[partition]
+        else:
+            start = consumer.committed(partition) or 0
+        stop = stops[partition]
+        if args.to_offset is not None:
+            stop = min(stop, args.to_offset)
+        ranges[partition] = (max(start, beginnings[partition]), stop)
+    return ranges
+
+
+class Progress:
+    def __init__(self, worker: int, ranges: dict[TopicPartition, tuple[int, int]]):
+        self.worker = worker
+        self.ranges = ranges
+        self.total = sum(max(stop - start, 0) for start, stop in ranges.values())
+        self.started_at = time.monotonic()
+        self.reported_at = self.started_at
+
+    def report(self, positions: dict[TopicPartition, int], force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.reported_at < settings.BACKFILL_PROGRESS_INTERVAL:
+            return
+        self.reported_at = now
+        done = sum(
+            min(positions[partition], stop) - start
+            for partition, (start, stop) in self.ranges.items()
+            if stop > start
+        )
+        rate = done / max(now - self.started_at, 1e-9)
+        eta = (self.total - done) / rate if rate else float("inf")
+        logger.info(
+            f"Backfill worker {self.worker}: {done}/{self.total} events "
+            f"({done / max(self.total, 1):.1%}), {rate:.0f} events/s, ETA {eta:.0f}s"
+        )
+
+
+def run_worker(args, worker: int, partitions: list[TopicPartition]):
+    table = args.topic
+    click = ClickDB()
+    consumer = KafkaQuery([table], f"{table}_backfill").get_partition_consumer(
+        partitions
+    )
+    ranges = offset_ranges(consumer, partitions, args)
+    positions = {}
+    for partition, (start, stop) in ranges.items():
+        consumer.seek(partition, start)
+        positions[partition] = start
+        if start >= stop:
+            consumer.pause(partition)
+    batch = Batch(
+        settings.BACKFILL_BATCH_COUNT,
+        settings.BACKFILL_BATCH_MAX_BYTES,
+        settings.BATCH_LINGER,
+    )
+    progress = Progress(worker, ranges)
+    while set(consumer.paused()) != set(partitions) or batch.events:
+        records = consumer.poll(
+            timeout_ms=batch.poll_timeout_ms(settings.POLL_TIMEOUT_MS),
+            max_records=batch.remaining,
+        )
+        for partition, partition_records in records.items():
+            _, stop = ranges[partition]
+            for record in partition_records:
+                if record.offset >= stop:
+                    consumer.pause(partition)
+                    break
+                try:
+                    event = KafkaQuery.decode(record)
+                    if not isinstance(event, dict):
+                        raise ValueError(f"not an object: {event!r}")
+                except ValueError as e:
+                    dead_letters.send(
+                        table, {"value": record.value}, f"Undecodable: {e}"
+                    )
+                    batch.skip(record)
+                else:
+                    batch.add(event, record)
+                positions[partition] = record.offset + 1
+        for partition, (_, stop) in ranges.items():
+            if consumer.position(partition) >= stop:
+                consumer.pause(partition)
+        finished = set(consumer.paused()) == set(partitions)
+        if batch.due() or (finished and batch.events):
+            if not flush(consumer, click, table, batch, target=f"{table}_shadow"):
+                for partition, (_, stop) in ranges.items():
+                    positions[partition] = consumer.position(partition)
+                    if positions[partition] < stop:
+                        consumer.resume(partition)
+        progress.report(positions)
+    progress.report(positions, force=True)
+    consumer.close()
+
+
+def run(args):
+    click = ClickDB()
+    create_shadow(
+        click,
+        args.topic,
+        fresh=args.from_timestamp is not None or args.from_offset is not None,
+    )
+    consumer = KafkaQuery(
+        [args.topic], f"{args.topic}_backfill"
+    ).get_partition_consumer()
+    partitions = [
+        TopicPartition(args.topic, partition)
+        for partition in sorted(consumer.partitions_for_topic(args.topic))
+    ]
+    consumer.close()
+    workers = [
+        Process(
+            target=run_worker, args=(args, worker, partitions[worker :: args.workers])
+        )
+        for worker in range(min(args.workers, len(partitions)))
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Reprocess the topic into the shadow")
+    run_parser.add_argument("topic", choices=settings.TOPICS)
+    start = run_parser.add_mutually_exclusive_group()
+    start.add_argument("--from-timestamp", type=datetime.fromisoformat)
+    start.add_argument("--from-offset", type=int)
+    run_parser.add_argument("--to-timestamp", type=datetime.fromisoformat)
+    run_parser.add_argument("--to-offset", type=int)
+    run_parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    swap_parser = commands.add_parser("swap", help="Swap the shadow table in")
+    swap_parser.add_argument("topic", choices=settings.TOPICS)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args)
+    else:
+        swap(ClickDB(), args.topic)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,9 @@ class ClickSettings(BaseConfig):
     CONNECT: str = "localhost"
     PORT: str = "9000"
     DATABASE: str = "statistics"
+    POOL_SIZE: int = 4
+    POOL_MAX_IDLE: float = 300.0
+    RETRY_MAX_TIME: float = 60.0
 
     class Config:
         env_prefix = "click_"
@@ -25,7 +28,33 @@ class ETLSettings(BaseSettings):
     LOGGER_PATH: str = "ETL.log"
     CONTENT_API: str = "http://content-delivery-service:8000/api/v1/films/"
     USER_API: str = "http://auth-service:8000/api/v1/users/"
-    BATCH_COUNT: int = 10
+    BATCH_COUNT: int = 5000
+    BATCH_MAX_BYTES: int = 8 * 1024 * 1024
+    BATCH_LINGER: float = 5.0
+    POLL_TIMEOUT_MS: int = 1000
+    ENRICH_CACHE_SIZE: int = 50000
+    ENRICH_CACHE_TTL: float = 300.0
+    ENRICH_WORKERS: int = 16
+    ENRICH_TIMEOUT: float = 5.0
+    TOPICS: list[str] = [
+        "bookmarks",
+        "clicks",
+        "comments",
+        "likes",
+        "movie_filter_requests",
+        "movie_player_changes_topic",
+        "movie_watch_times",
+    ]
+    GROUP_ID: str = "ugc_etl"
+    WORKERS: int = 2
+    DEAD_LETTER_TOPIC: str = "ugc_dead_letters"
+    DEAD_LETTER_PATH: str = "dead_letters.jsonl"
+    DEAD_LETTER_TIMEOUT: float = 10.0
+    STATS_INTERVAL: float = 15.0
+    METRICS_PORT: int = 0
+    BACKFILL_BATCH_COUNT: int = 100000
+    BACKFILL_BATCH_MAX_BYTES: int = 64 * 1024 * 1024
+    BACKFILL_PROGRESS_INTERVAL: float = 10.0
 
     class Config:
         env_prefix = "etl_"
@@ -1,41 +1,243 @@
+import atexit
+import queue
+import struct
+import threading
+import time
 import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable
 
 import backoff
-from clickhouse_driver import connect
-from clickhouse_driver.dbapi.errors import OperationalError
-from clickhouse_driver.errors import NetworkError
+import orjson
+from clickhouse_driver import Client
+from clickhouse_driver.errors import Error as ClickHouseError
+from clickhouse_driver.errors import NetworkError, ServerException, SocketTimeoutError
 from core.config import ClickSettings
 from core.logger import get_logger
-from dateutil.parser import parse
+from data.schema import table_columns
 
 from .abc import AbstractDB
 
 settings = ClickSettings()
 logger = get_logger()
 
+NETWORK_ERRORS = (ConnectionError, EOFError, NetworkError, SocketTimeoutError)
+
+# Errors raised by the driver while encoding a block, or by the server while
+# inserting it; unless retryable, they are caused by the rows.
+ROW_ERRORS = (ClickHouseError, TypeError, ValueError, OverflowError, struct.error)
+# Server errors of an unavailable, overloaded or timed out server: the batch is
+# retried as a whole rather than bisected.
+RETRYABLE_SERVER_ERRORS = {
+    159,  # TIMEOUT_EXCEEDED
+    164,  # READONLY
+    202,  # TOO_MANY_SIMULTANEOUS_QUERIES
+    203,  # NO_FREE_CONNECTION
+    209,  # SOCKET_TIMEOUT
+    210,  # NETWORK_ERROR
+    241,  # MEMORY_LIMIT_EXCEEDED
+    242,  # TABLE_IS_READ_ONLY
+    285,  # TOO_FEW_LIVE_REPLICAS
+    286,  # UNSATISFIED_QUORUM_FOR_PREVIOUS_WRITE
+    319,  # UNKNOWN_STATUS_OF_INSERT
+    425,  # SYSTEM_ERROR
+    999,  # KEEPER_EXCEPTION
+}
+TOO_MANY_PARTS = 252
+
+NIL_UUID = uuid.UUID(int=0)
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+
+
+def to_uuid(value) -> uuid.UUID:
+    if value is None:
+        return NIL_UUID
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def to_string(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return orjson.dumps(value).decode()
+
+
+def to_int32(value) -> int:
+    value = int(value or 0)
+    if not INT32_MIN <= value <= INT32_MAX:
+        raise ValueError(f"{value} is out of the Int32 range")
+    return value
+
+
+def to_names(value) -> list[str]:
+    """Genres and persons come from the content API as objects with a name."""
+    if not isinstance(value, (list, tuple, type(None))):
+        raise TypeError(f"Expected a list, got {type(value).__name__}")
+    return [
+        item if isinstance(item, str) else item.get("name") or item.get("full_name", "")
+        for item in value or ()
+    ]
+
+
+def to_datetime(value) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+# Converts event values to the python types of the column, rejecting values the
+# column can't hold; missing values become the column defaults, as ClickHouse
+# does for omitted columns, except for a missing event time, which becomes the
+# time of the insert so that the row lands in a current partition.
+column_converters = {
+    "UUID": to_uuid,
+    "String": to_string,
+    "Int32": to_int32,
+    "Float32": lambda value: float(value or 0),
+    "Array(String)": to_names,
+    "DateTime64": to_datetime,
+}
+
+
+def convert_row(table: str, event: dict) -> list:
+    """Validates the event against the table columns and returns its row."""
+    row = [uuid.uuid4()]
+    for name, column_type in table_columns[table]:
+        try:
+            row.append(column_converters[column_type](event.get(name)))
+        except (AttributeError, TypeError, ValueError) as e:
+            raise RowError(f"{name}: {e}") from e
+    return row
+
+
+def retryable(error: ServerException, rows: int) -> bool:
+    """Whether the server refused the insert for a reason other than its rows."""
+    if error.code == TOO_MANY_PARTS:
+        # The same code means too many partitions in the block, which smaller
+        # blocks avoid, and too many parts in a partition, i.e. overload.
+        return rows == 1 or "partitions" not in str(error.message).lower()
+    return error.code in RETRYABLE_SERVER_ERRORS
+
+
+class RowError(ValueError):
+    """The event does not fit the columns of its table."""
+
+
+class ClickPool:
+    """Persistent ClickHouse connections shared by every ClickDB of the process.
+
+    The driver pings a connection before each query and reconnects if the ping
+    fails; connections idle for longer than ``max_idle`` seconds are reopened
+    up front, and a connection that hit a network error is dropped, so the next
+    checkout (e.g. the backoff retry) gets a fresh one.
+    """
+
+    def __init__(self, size: int, max_idle: float):
+        self.max_idle = max_idle
+        self._idle: queue.LifoQueue[tuple[Client, float]] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @staticmethod
+    def _connect() -> Client:
+        return Client(host=settings.CONNECT, port=settings.PORT)
+
+    def _checkout(self) -> Client:
+        try:
+            client, released_at = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        if time.monotonic() - released_at > self.max_idle:
+            client.disconnect()
+        return client
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        client = None
+        try:
+            client = self._checkout()
+            yield client
+        except NETWORK_ERRORS:
+            if client is not None:
+                client.disconnect()
+                client = None
+            raise
+        finally:
+            if client is not None:
+                self._idle.put((client, time.monotonic()))
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                client, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            client.disconnect()
+
+
+click_pool = ClickPool(settings.POOL_SIZE, settings.POOL_MAX_IDLE)
+atexit.register(click_pool.close)
+
 
 class ClickDB(AbstractDB):
-    def insert(self, table: str, batch: list):
-        """Forming an insertion string in the database."""
-        query = f"INSERT INTO {settings.DATABASE}.{table} "
-        colums_table = list(batch[0].keys())
-        values_table = []
-        for row in batch:
-            unit = []
-            for key in colums_table:
-                value = row[key]
-                if value is None:
-                    value = "NULL"
-                if key == "created_at":
-                    value = parse(value)
-                    value = str(value.date()) + " " + str(value.time())
-                unit.append(value)
-            unit.append(str(uuid.uuid4()))
-            values_table.append(f"{tuple(unit)}")
-        colums_table.append("uuid")
-        query += f"({', '.join(colums_table)}) VALUES {', '.join(values_table)}"
-        query = query.replace("""'NULL'""", """NULL""")
-        return self.__execute(query)
+    def insert(
+        self, table: str, batch: list, on_reject: Callable, target: str | None = None
+    ) -> bool:
+        """Inserts the batch as native columns typed by the table column spec.
+
+        Rows go to ``target`` if given, a table with the columns of ``table``.
+
+        Events that don't fit the columns, or that ClickHouse refuses, are passed
+        to ``on_reject(table, event, error)`` and the rest are inserted. Returns
+        False if ClickHouse stayed unavailable, the batch should be retried then.
+        """
+        events, rows = [], []
+        for event in batch:
+            try:
+                rows.append(convert_row(table, event))
+            except RowError as e:
+                on_reject(table, event, str(e))
+            else:
+                events.append(event)
+        names = ", ".join(["uuid", *(name for name, _ in table_columns[table])])
+        query = f"INSERT INTO {settings.DATABASE}.{target or table} ({names}) VALUES"
+        return self.__insert_rows(query, table, events, rows, on_reject)
+
+    def __insert_rows(self, query, table, events, rows, on_reject) -> bool:
+        """Bisects a failing batch until the rows that break the insert are found."""
+        if not rows:
+            return True
+        try:
+            columns = [list(column) for column in zip(*rows)]
+            return self.__execute(query, columns, columnar=True) is not None
+        except ROW_ERRORS as e:
+            if isinstance(e, ServerException) and retryable(e, len(rows)):
+                logger.error(f"Insert into {table} failed: {e}")
+                return False
+            if len(rows) == 1:
+                on_reject(table, events[0], str(e))
+                return True
+        middle = len(rows) // 2
+        return self.__insert_rows(
+            query, table, events[:middle], rows[:middle], on_reject
+        ) and self.__insert_rows(
+            query, table, events[middle:], rows[middle:], on_reject
+        )
+
+    def execute(self, query: str, params=None, **kwargs):
+        """Runs a query and returns its rows.
+
+        Raises ConnectionError if ClickHouse stays unreachable.
+        """
+        result = self.__execute(query, params, **kwargs)
+        if result is None:
+            raise ConnectionError("ClickHouse is unavailable")
+        return result
 
     def create(self, query):
         """Method for executing raw queries."""
@@ -48,11 +250,11 @@ class ClickDB(AbstractDB):
 
     @backoff.on_exception(
         backoff.expo,
-        (ConnectionError, NetworkError, OperationalError),
+        NETWORK_ERRORS,
+        max_time=settings.RETRY_MAX_TIME,
         raise_on_giveup=False,
         logger=logger,
     )
-    def __execute(self, query: str):
-        with connect(f"clickhouse://{settings.CONNECT}:{settings.PORT}") as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
+    def __execute(self, query: str, data=None, **kwargs):
+        with click_pool.connection() as client:
+            return client.execute(query, data, **kwargs)
@@ -1,30 +1,97 @@
-import json
-
 import backoff
 from core.config import KafkaSettings
 from core.logger import get_logger
 from kafka3 import KafkaConsumer
+from kafka3.structs import OffsetAndMetadata, TopicPartition
 
 from .abc import AbstractQueue
+from .serializers import loads
 
 kafka_settings = KafkaSettings()
 logger = get_logger()
 
 
 class KafkaQuery(AbstractQueue):
-    def __init__(self, topic):
-        self.topic = topic
+    def __init__(self, topics: list[str], group_id: str):
+        self.topics = topics
+        self.group_id = group_id
 
     @backoff.on_exception(backoff.expo, Exception, raise_on_giveup=False, logger=logger)
-    def get_consumer(self):
-        """Creating a consumer for a specific topic."""
+    def get_consumer(self, listener=None):
+        """Creating a consumer of the topics in the consumer group.
+
+        Partitions without a committed offset are read from the beginning, so
+        events produced before the group first consumed them are not skipped.
+        """
         consumer = KafkaConsumer(
-            self.topic,
             bootstrap_servers=kafka_settings.SERVERS,
-            group_id=self.topic,
+            group_id=self.group_id,
             reconnect_backoff_ms=1000,
             reconnect_backoff_max_ms=600000,
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
             enable_auto_commit=False,
+            auto_offset_reset="earliest",
         )
+        consumer.subscribe(self.topics, listener=listener)
         return consumer
+
+    @backoff.on_exception(backoff.expo, Exception, raise_on_giveup=False, logger=logger)
+    def get_partition_consumer(self, partitions=None):
+        """Creating a consumer of the given partitions, assigned without rebalancing.
+
+        Offsets are still committed to the consumer group, so a stopped consumer
+        can resume; ``partitions=None`` only connects, e.g. to list partitions.
+        """
+        consumer = KafkaConsumer(
+            bootstrap_servers=kafka_settings.SERVERS,
+            group_id=self.group_id,
+            reconnect_backoff_ms=1000,
+            reconnect_backoff_max_ms=600000,
+            enable_auto_commit=False,
+        )
+        if partitions:
+            consumer.assign(partitions)
+        return consumer
+
+    def seed_offsets(self, previous_groups: dict[str, str]):
+        """Starts the group where the previous group of each topic stopped.
+
+        For every partition of the topics without an offset committed in the
+        group, the offset committed by ``previous_groups[topic]`` is committed,
+        so moving topics to a new group neither skips nor rereads their backlog.
+        Must run while the group has no members.
+        """
+        consumer = self.get_partition_consumer()
+        partitions = [
+            TopicPartition(topic, partition)
+            for topic in self.topics
+            for partition in sorted(consumer.partitions_for_topic(topic) or ())
+        ]
+        missing = [
+            partition
+            for partition in partitions
+            if consumer.committed(partition) is None
+            and partition.topic in previous_groups
+        ]
+        offsets = {}
+        for topic, group_id in previous_groups.items():
+            topic_partitions = [p for p in missing if p.topic == topic]
+            if not topic_partitions:
+                continue
+            previous = KafkaQuery([topic], group_id).get_partition_consumer()
+            for partition in topic_partitions:
+                offset = previous.committed(partition)
+                if offset is not None:
+                    offsets[partition] = OffsetAndMetadata(offset, None)
+            previous.close()
+        if offsets:
+            consumer.commit(offsets)
+            logger.info(
+                f"Group {self.group_id} starts {len(offsets)} partitions "
+                "at the offsets of their previous groups"
+            )
+        consumer.close()
+
+    @staticmethod
+    def decode(message) -> dict:
+        """Decodes the value of a consumed record using its format header."""
+        return loads(message.value, message.headers)
@@ -0,0 +1,34 @@
+from typing import Callable
+
+import msgpack
+import orjson
+
+FORMAT_HEADER = "ugc-format"
+DEFAULT_FORMAT = "json.v1"
+
+deserializers: dict[str, Callable[[bytes], dict]] = {
+    "json.v1": orjson.loads,
+    "msgpack.v1": msgpack.unpackb,
+}
+
+
+def get_format(headers: list[tuple[str, bytes | None]] | None) -> str:
+    """Reads the value format from the record headers.
+
+    Records produced before the header was introduced, or with a null header
+    value, are plain JSON.
+    """
+    for key, value in headers or ():
+        if key == FORMAT_HEADER and value is not None:
+            return value.decode("utf-8")
+    return DEFAULT_FORMAT
+
+
+def loads(value: bytes, headers: list[tuple[str, bytes]] | None = None) -> dict:
+    """Decodes a record value according to its ``ugc-format`` header."""
+    value_format = get_format(headers)
+    try:
+        deserializer = deserializers[value_format]
+    except KeyError:
+        raise ValueError(f"Unsupported value format: {value_format}")
+    return deserializer(value)
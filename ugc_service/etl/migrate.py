@@ -0,0 +1,79 @@
+"""Applies the pending ClickHouse migrations of ``migrations/`` in version order.
+
+A migration is a module named ``<version>_<name>.py`` with a ``queries`` list,
+or an ``apply(click)`` function for steps that depend on the current schema.
+Applied versions are recorded in the replicated ``schema_migrations`` table, so
+every node sees the same history and a migration runs once for the cluster.
+"""
+
+import importlib
+import os
+import pkgutil
+import sys
+
+sys.path.append(os.getcwd())
+
+import migrations
+from core.logger import get_logger
+from data.schema import cluster_name, database_name
+from db.click import ClickDB
+
+logger = get_logger()
+
+bootstrap_queries = [
+    f"CREATE DATABASE IF NOT EXISTS {database_name} ON CLUSTER {cluster_name}",
+    f"""CREATE TABLE IF NOT EXISTS {database_name}.schema_migrations
+        ON CLUSTER {cluster_name}
+        (
+            version UInt32,
+            name String,
+            applied_at DateTime DEFAULT now()
+        )ENGINE = ReplicatedMergeTree(
+            '/clickhouse/tables/all/{database_name}/schema_migrations', '{{replica}}'
+        ) ORDER BY version
+        """,
+]
+
+
+def available_migrations() -> list[tuple[int, str]]:
+    found = []
+    for module in pkgutil.iter_modules(migrations.__path__):
+        version, _, name = module.name.partition("_")
+        if version.isdigit():
+            found.append((int(version), module.name))
+    return sorted(found)
+
+
+def migrate(click: ClickDB) -> bool:
+    """Returns False if a migration failed; later migrations are not attempted."""
+    for query in bootstrap_queries:
+        click.execute(query)
+    applied = {
+        version
+        for version, in click.execute(
+            f"SELECT version FROM {database_name}.schema_migrations"
+        )
+    }
+    for version, module_name in available_migrations():
+        if version in applied:
+            continue
+        module = importlib.import_module(f"migrations.{module_name}")
+        logger.info(f"Applying migration {module_name}")
+        try:
+            if hasattr(module, "apply"):
+                module.apply(click)
+            else:
+                for query in module.queries:
+                    click.execute(query)
+        except Exception as e:
+            logger.error(f"Migration {module_name} failed: {e}")
+            return False
+        click.execute(
+            f"INSERT INTO {database_name}.schema_migrations (version, name) VALUES",
+            [(version, module_name)],
+        )
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if migrate(ClickDB()) else 1)
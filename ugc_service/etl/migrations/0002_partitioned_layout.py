@@ -0,0 +1,152 @@
+"""Monthly partitioned, replicated tables behind Distributed tables.
+
+Every ``<table>`` becomes a Distributed table over ``<table>_local``, a
+ReplicatedMergeTree on each node of the cluster partitioned by month of
+``created_at`` and ordered for per-movie and per-user queries. Rows older than
+the table's retention are dropped by TTL a whole part at a time. The tables of
+the original layout are renamed to ``<table>_legacy`` and their rows copied
+over, keeping their ``uuid``; drop them once the copy is checked.
+"""
+
+from data.schema import cluster_name, database_name
+
+user_columns = """
+                user_id UUID,
+                first_name LowCardinality(String),
+                last_name LowCardinality(String),
+                role_id UUID,"""
+movie_columns = """
+                movie_id UUID,
+                description String,
+                imdb_rating Float32,
+                genres Array(LowCardinality(String)),
+                directors Array(LowCardinality(String)),
+                actors Array(LowCardinality(String)),
+                writers Array(LowCardinality(String)),"""
+legacy_user_columns = "user_id, first_name, last_name, role_id"
+legacy_movie_columns = (
+    "movie_id, description, imdb_rating, genres, directors, actors, writers"
+)
+
+# table: (event columns, sorting key, retention in months, columns of the legacy table)
+tables = {
+    "bookmarks": (
+        user_columns + movie_columns,
+        "movie_id, user_id, created_at",
+        24,
+        f"{legacy_user_columns}, {legacy_movie_columns}, created_at",
+    ),
+    "clicks": (
+        user_columns + "\n                resource LowCardinality(String),",
+        "user_id, created_at",
+        6,
+        f"{legacy_user_columns}, resource, created_at",
+    ),
+    "comments": (
+        user_columns + movie_columns + "\n                content String,",
+        "movie_id, user_id, created_at",
+        24,
+        f"{legacy_user_columns}, {legacy_movie_columns}, content, created_at",
+    ),
+    "likes": (
+        user_columns + movie_columns,
+        "movie_id, user_id, created_at",
+        24,
+        f"{legacy_user_columns}, {legacy_movie_columns}, created_at",
+    ),
+    "movie_filter_requests": (
+        user_columns + "\n                filters String,",
+        "user_id, created_at",
+        6,
+        f"{legacy_user_columns}, filters, created_at",
+    ),
+    "movie_player_changes_topic": (
+        user_columns
+        + movie_columns
+        + """
+                change_type LowCardinality(String),
+                old_value LowCardinality(String),
+                new_value LowCardinality(String),""",
+        "movie_id, user_id, created_at",
+        3,
+        f"{legacy_user_columns}, {legacy_movie_columns}, "
+        "change_type, old_value, new_value",
+    ),
+    "movie_watch_times": (
+        user_columns
+        + movie_columns
+        + """
+                seconds_amt Int32,
+                total_seconds_amt Int32,""",
+        "movie_id, user_id, created_at",
+        12,
+        f"{legacy_user_columns}, {legacy_movie_columns}, "
+        "seconds_amt, total_seconds_amt, created_at",
+    ),
+}
+
+
+def local_table_query(local_name, zookeeper_name, columns, order_by, retention):
+    """Creates a ``<table>_local`` layout table replicated under ``zookeeper_name``."""
+    return f"""CREATE TABLE IF NOT EXISTS {database_name}.{local_name}
+            ON CLUSTER {cluster_name}
+             (
+                uuid UUID,{columns}
+                created_at DateTime64(3) DEFAULT now64(3)
+            )ENGINE = ReplicatedMergeTree(
+                '/clickhouse/tables/{{shard}}/{database_name}/{zookeeper_name}',
+                '{{replica}}'
+            )
+            PARTITION BY toYYYYMM(created_at)
+            ORDER BY ({order_by})
+            TTL toDateTime(created_at) + INTERVAL {retention} MONTH
+            SETTINGS ttl_only_drop_parts = 1
+            """
+
+
+def table_queries(table_name, columns, order_by, retention, legacy_columns):
+    local = f"{database_name}.{table_name}_local"
+    return [
+        local_table_query(
+            f"{table_name}_local", f"{table_name}_local", columns, order_by, retention
+        ),
+        f"RENAME TABLE {database_name}.{table_name} "
+        f"TO {database_name}.{table_name}_legacy ON CLUSTER {cluster_name}",
+        f"""CREATE TABLE IF NOT EXISTS {database_name}.{table_name}
+            ON CLUSTER {cluster_name} AS {local}
+            ENGINE = Distributed({cluster_name}, {database_name}, {table_name}_local, rand())
+            """,
+        # Only the rows not copied yet, so an interrupted copy can be resumed; the
+        # legacy tables are not replicated, so their rows are read from every node.
+        f"INSERT INTO {database_name}.{table_name} (uuid, {legacy_columns}) "
+        f"SELECT uuid, {legacy_columns} FROM clusterAllReplicas("
+        f"{cluster_name}, {database_name}, {table_name}_legacy) "
+        f"WHERE uuid GLOBAL NOT IN (SELECT uuid FROM {database_name}.{table_name})",
+    ]
+
+
+def table_engine(click, table_name: str) -> str | None:
+    rows = click.execute(
+        "SELECT engine FROM system.tables WHERE database = %(database)s "
+        "AND name = %(name)s",
+        {"database": database_name, "name": table_name},
+    )
+    return rows[0][0] if rows else None
+
+
+def apply(click):
+    """Moves table by table, checking the current schema before every step.
+
+    A failed run can be applied again: it resumes where it stopped, and the copy
+    only inserts the legacy rows still missing from the new table.
+    """
+    for table_name, spec in tables.items():
+        create_local, rename, create_distributed, copy = table_queries(
+            table_name, *spec
+        )
+        click.execute(create_local)
+        if table_engine(click, table_name) not in (None, "Distributed"):
+            click.execute(rename)
+        click.execute(create_distributed)
+        if table_engine(click, f"{table_name}_legacy") is not None:
+            click.execute(copy)
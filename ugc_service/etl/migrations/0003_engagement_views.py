@@ -0,0 +1,119 @@
+"""Pre-aggregated watch-time and like metrics maintained on insert.
+
+Each view is an AggregatingMergeTree ``<view>_local`` on every node, filled by a
+materialized view over the ``<table>_local`` rows written to that node, and a
+Distributed ``<view>`` that merges the states of both shards. Existing rows are
+aggregated once when the views are created; the ETL is not running then, since
+migrations are applied before it starts. The aggregates cannot tell the same row
+counted twice apart, so a rerun after a failure only aggregates the existing rows
+into the views that are still empty.
+"""
+
+from data.schema import cluster_name, database_name
+
+# view: (source table, aggregate columns, sorting key, select of the materialized view)
+views = {
+    # Heartbeats report the playback position, so the watch time of a user in a
+    # movie on a day is the furthest position reached, not the sum of positions.
+    "movie_watch_daily": (
+        "movie_watch_times",
+        """
+                movie_id UUID,
+                day Date,
+                user_id UUID,
+                watch_seconds SimpleAggregateFunction(max, Int32),
+                events SimpleAggregateFunction(sum, UInt64),
+                completion SimpleAggregateFunction(max, Float64)""",
+        "movie_id, day, user_id",
+        """
+                movie_id,
+                toDate(created_at) AS day,
+                user_id,
+                max(seconds_amt) AS watch_seconds,
+                count() AS events,
+                max(
+                    if(total_seconds_amt > 0, least(seconds_amt / total_seconds_amt, 1), 0)
+                ) AS completion
+            FROM {source}
+            GROUP BY movie_id, day, user_id""",
+    ),
+    "user_last_position": (
+        "movie_watch_times",
+        """
+                user_id UUID,
+                movie_id UUID,
+                seconds_amt AggregateFunction(argMax, Int32, DateTime64(3)),
+                total_seconds_amt AggregateFunction(argMax, Int32, DateTime64(3)),
+                updated_at SimpleAggregateFunction(max, DateTime64(3))""",
+        "user_id, movie_id",
+        """
+                user_id,
+                movie_id,
+                argMaxState(seconds_amt, created_at) AS seconds_amt,
+                argMaxState(total_seconds_amt, created_at) AS total_seconds_amt,
+                max(created_at) AS updated_at
+            FROM {source}
+            GROUP BY user_id, movie_id""",
+    ),
+    "movie_likes_daily": (
+        "likes",
+        """
+                movie_id UUID,
+                day Date,
+                likes SimpleAggregateFunction(sum, UInt64),
+                likers AggregateFunction(uniq, UUID)""",
+        "movie_id, day",
+        """
+                movie_id,
+                toDate(created_at) AS day,
+                count() AS likes,
+                uniqState(user_id) AS likers
+            FROM {source}
+            GROUP BY movie_id, day""",
+    ),
+}
+
+
+def local_view_query(local_name, zookeeper_name, columns, order_by):
+    """Creates a ``<view>_local`` aggregate table replicated under ``zookeeper_name``."""
+    return f"""CREATE TABLE IF NOT EXISTS {database_name}.{local_name}
+            ON CLUSTER {cluster_name}
+             ({columns}
+            )ENGINE = ReplicatedAggregatingMergeTree(
+                '/clickhouse/tables/{{shard}}/{database_name}/{zookeeper_name}',
+                '{{replica}}'
+            )
+            ORDER BY ({order_by})
+            """
+
+
+def materialized_view_query(view_name, source_table, select):
+    return f"""CREATE MATERIALIZED VIEW IF NOT EXISTS {database_name}.{view_name}_mv
+            ON CLUSTER {cluster_name} TO {database_name}.{view_name}_local
+            AS SELECT{select.format(source=f"{database_name}.{source_table}_local")}
+            """
+
+
+def view_queries(view_name, source_table, columns, order_by, select):
+    local = f"{database_name}.{view_name}_local"
+    return [
+        local_view_query(f"{view_name}_local", f"{view_name}_local", columns, order_by),
+        materialized_view_query(view_name, source_table, select),
+        f"""CREATE TABLE IF NOT EXISTS {database_name}.{view_name}
+            ON CLUSTER {cluster_name} AS {local}
+            ENGINE = Distributed({cluster_name}, {database_name}, {view_name}_local, rand())
+            """,
+        f"INSERT INTO {database_name}.{view_name} "
+        f"SELECT{select.format(source=f'{database_name}.{source_table}')}",
+    ]
+
+
+def apply(click):
+    """Creates the views one by one, backfilling each only while it is empty."""
+    for view_name, spec in views.items():
+        *create_queries, backfill = view_queries(view_name, *spec)
+        for query in create_queries:
+            click.execute(query)
+        ((rows,),) = click.execute(f"SELECT count() FROM {database_name}.{view_name}")
+        if not rows:
+            click.execute(backfill)
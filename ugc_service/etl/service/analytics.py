@@ -0,0 +1,117 @@
+"""Dashboard queries over the pre-aggregated engagement views.
+
+The views keep one row per movie, day and viewer (or user and movie) per part,
+so the queries merge aggregates instead of scanning raw events.
+"""
+
+import uuid
+from datetime import date
+
+from data.schema import database_name
+from db.click import ClickDB
+
+
+def rows_as_dicts(click: ClickDB, query: str, params: dict) -> list[dict]:
+    rows, columns = click.execute(query, params, with_column_types=True)
+    names = [name for name, _ in columns]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def movie_watch_time(
+    click: ClickDB, movie_id: uuid.UUID, date_from: date, date_to: date
+) -> list[dict]:
+    """Daily watch time, average completion ratio and viewers of a movie.
+
+    The watch time of a viewer on a day is the furthest position they reached.
+    """
+    return rows_as_dicts(
+        click,
+        f"""SELECT
+                day,
+                sum(toInt64(position)) AS watch_seconds,
+                sum(heartbeats) AS events,
+                avg(user_completion) AS completion,
+                count() AS viewers
+            FROM (
+                SELECT
+                    day,
+                    user_id,
+                    max(watch_seconds) AS position,
+                    sum(events) AS heartbeats,
+                    max(completion) AS user_completion
+                FROM {database_name}.movie_watch_daily
+                WHERE movie_id = %(movie_id)s
+                    AND day BETWEEN %(date_from)s AND %(date_to)s
+                GROUP BY day, user_id
+            )
+            GROUP BY day
+            ORDER BY day""",
+        {"movie_id": movie_id, "date_from": date_from, "date_to": date_to},
+    )
+
+
+def top_watched_movies(
+    click: ClickDB, date_from: date, date_to: date, limit: int = 10
+) -> list[dict]:
+    """Movies with the most watch time in the period."""
+    return rows_as_dicts(
+        click,
+        f"""SELECT
+                movie_id,
+                sum(toInt64(position)) AS watch_seconds,
+                avg(user_completion) AS completion,
+                uniqExact(user_id) AS viewers
+            FROM (
+                SELECT
+                    movie_id,
+                    day,
+                    user_id,
+                    max(watch_seconds) AS position,
+                    max(completion) AS user_completion
+                FROM {database_name}.movie_watch_daily
+                WHERE day BETWEEN %(date_from)s AND %(date_to)s
+                GROUP BY movie_id, day, user_id
+            )
+            GROUP BY movie_id
+            ORDER BY watch_seconds DESC
+            LIMIT %(limit)s""",
+        {"date_from": date_from, "date_to": date_to, "limit": limit},
+    )
+
+
+def user_last_position(
+    click: ClickDB, user_id: uuid.UUID, movie_id: uuid.UUID | None = None
+) -> list[dict]:
+    """Last reported position of the user in a movie, or in every movie watched."""
+    movie_filter = "AND movie_id = %(movie_id)s" if movie_id else ""
+    return rows_as_dicts(
+        click,
+        f"""SELECT
+                movie_id,
+                argMaxMerge(seconds_amt) AS seconds_amt,
+                argMaxMerge(total_seconds_amt) AS total_seconds_amt,
+                max(updated_at) AS updated_at
+            FROM {database_name}.user_last_position
+            WHERE user_id = %(user_id)s {movie_filter}
+            GROUP BY movie_id
+            ORDER BY updated_at DESC""",
+        {"user_id": user_id, "movie_id": movie_id},
+    )
+
+
+def movie_likes(
+    click: ClickDB, movie_id: uuid.UUID, date_from: date, date_to: date
+) -> list[dict]:
+    """Daily likes and distinct likers of a movie."""
+    return rows_as_dicts(
+        click,
+        f"""SELECT
+                day,
+                sum(likes) AS likes,
+                uniqMerge(likers) AS likers
+            FROM {database_name}.movie_likes_daily
+            WHERE movie_id = %(movie_id)s AND day BETWEEN %(date_from)s AND %(date_to)s
+            GROUP BY day
+            ORDER BY day""",
+        {"movie_id": movie_id, "date_from": date_from, "date_to": date_to},
+    )
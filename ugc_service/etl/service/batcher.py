@@ -0,0 +1,67 @@
+import time
+
+from kafka3.structs import OffsetAndMetadata, TopicPartition
+
+
+class Batch:
+    """Events consumed since the last insert and the offsets they came from.
+
+    The batch is due when it reaches ``max_rows`` events or ``max_bytes`` of
+    record values, or when its oldest event has waited ``linger`` seconds.
+    """
+
+    def __init__(self, max_rows: int, max_bytes: int, linger: float):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.linger = linger
+        self.clear()
+
+    def clear(self):
+        self.events: list[dict] = []
+        self.bytes = 0
+        self.started_at: float | None = None
+        self._offsets: dict[TopicPartition, tuple[int, int]] = {}
+
+    def add(self, event: dict, record):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        self.events.append(event)
+        self.bytes += len(record.value or b"")
+        self.skip(record)
+
+    def skip(self, record):
+        """Counts the record as consumed, so its offset is committed with the batch."""
+        partition = TopicPartition(record.topic, record.partition)
+        first, _ = self._offsets.get(partition, (record.offset, record.offset))
+        self._offsets[partition] = (first, record.offset)
+
+    @property
+    def remaining(self) -> int:
+        return max(self.max_rows - len(self.events), 1)
+
+    def poll_timeout_ms(self, max_timeout_ms: int) -> int:
+        """Waits for new records no longer than the batch may still linger."""
+        if self.started_at is None:
+            return max_timeout_ms
+        left = self.started_at + self.linger - time.monotonic()
+        return max(0, min(max_timeout_ms, int(left * 1000)))
+
+    def due(self) -> bool:
+        if not self.events:
+            return False
+        return (
+            len(self.events) >= self.max_rows
+            or self.bytes >= self.max_bytes
+            or time.monotonic() - self.started_at >= self.linger
+        )
+
+    def commit_offsets(self) -> dict[TopicPartition, OffsetAndMetadata]:
+        return {
+            partition: OffsetAndMetadata(last + 1, None)
+            for partition, (_, last) in self._offsets.items()
+        }
+
+    def rewind(self, consumer):
+        """Moves the consumer back so the events of the batch are read again."""
+        for partition, (first, _) in self._offsets.items():
+            consumer.seek(partition, first)
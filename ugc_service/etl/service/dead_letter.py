@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+from core.config import ETLSettings, KafkaSettings
+from core.logger import get_logger
+from kafka3 import KafkaProducer
+from kafka3.errors import KafkaError
+
+settings = ETLSettings()
+kafka_settings = KafkaSettings()
+logger = get_logger()
+
+# Keys of stored rejects remembered to skip the rejects of a retried batch.
+STORED_KEYS = 100000
+
+
+class DeadLetters:
+    """Keeps the events ClickHouse rejected so they can be fixed and replayed.
+
+    ``send`` only queues a reject; ``flush`` stores the queued ones before the
+    offsets of their batch are committed. Rejects are produced to ``topic``;
+    without a topic, or when Kafka refuses a record, they are appended to the
+    JSON lines file at ``path``. Rejects that could not be stored stay queued
+    and ``flush`` returns False, so the batch is rewound instead of committed.
+    A reject already queued or stored is not sent again when its batch is
+    retried.
+    """
+
+    def __init__(self, topic: str, path: str, timeout: float):
+        self.topic = topic
+        self.path = path
+        self.timeout = timeout
+        self.rejected = 0
+        self._producer = None
+        self._pending: dict[bytes, tuple[str, bytes]] = {}
+        self._stored: OrderedDict[bytes, None] = OrderedDict()
+        self._futures = {}
+        self._file_lock = threading.Lock()
+
+    def send(self, table: str, event: dict, error: str):
+        key = hashlib.blake2b(
+            orjson.dumps([table, error, event], default=str), digest_size=16
+        ).digest()
+        if key in self._pending or key in self._stored:
+            return
+        self.rejected += 1
+        logger.error(f"Rejected {table} event: {error}")
+        self._pending[key] = table, orjson.dumps(
+            {
+                "table": table,
+                "error": error,
+                "rejected_at": time.time(),
+                "event": event,
+            },
+            default=str,
+        )
+
+    def flush(self) -> bool:
+        """Stores the queued rejects; returns False if some of them are not stored."""
+        if not self._pending:
+            return True
+        if self.topic:
+            stored = self._produce()
+        else:
+            stored = [
+                key for key, (_, value) in self._pending.items() if self._write(value)
+            ]
+        for key in stored:
+            del self._pending[key]
+            self._stored[key] = None
+        while len(self._stored) > STORED_KEYS:
+            self._stored.popitem(last=False)
+        if self._pending:
+            logger.error(f"{len(self._pending)} rejected events are not stored yet")
+        return not self._pending
+
+    def _produce(self) -> list[bytes]:
+        try:
+            if self._producer is None:
+                self._producer = KafkaProducer(
+                    bootstrap_servers=kafka_settings.SERVERS,
+                    max_block_ms=int(self.timeout * 1000),
+                )
+            for key, (table, value) in self._pending.items():
+                future = self._futures.get(key)
+                if future is None or future.failed():
+                    self._futures[key] = self._producer.send(
+                        self.topic, value=value, key=table.encode()
+                    )
+            self._producer.flush(timeout=self.timeout)
+        except (KafkaError, BufferError) as e:
+            logger.error(f"Dead letter topic is unavailable: {e}")
+        stored = []
+        for key, future in list(self._futures.items()):
+            if not future.is_done:
+                continue
+            del self._futures[key]
+            if future.succeeded() or self._write(self._pending[key][1]):
+                stored.append(key)
+        return stored
+
+    def _write(self, value: bytes) -> bool:
+        try:
+            with self._file_lock, open(self.path, "ab") as file:
+                file.write(value + b"\n")
+        except OSError as e:
+            logger.error(f"Dead letter file is unavailable: {e}")
+            return False
+        return True
+
+
+dead_letters = DeadLetters(
+    settings.DEAD_LETTER_TOPIC, settings.DEAD_LETTER_PATH, settings.DEAD_LETTER_TIMEOUT
+)
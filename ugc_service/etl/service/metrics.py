@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.config import ETLSettings
+from core.logger import get_logger
+from service.dead_letter import dead_letters
+from service.other_service import enrichment_cache
+
+settings = ETLSettings()
+logger = get_logger()
+
+BATCH_SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+class ETLMetrics:
+    """Throughput, batch, timing and lag statistics of one ETL worker.
+
+    The consumer loop records into it and calls ``report`` on every iteration;
+    once per ``interval`` seconds it refreshes the partition lag (the consumer
+    is not thread-safe, so only the loop may query Kafka) and logs a stats line.
+    ``render`` returns the same numbers in the Prometheus text format.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.messages: dict[str, int] = defaultdict(int)
+        self.batches: dict[str, int] = defaultdict(int)
+        self.parse_seconds: dict[str, float] = defaultdict(float)
+        self.insert_seconds: dict[str, float] = defaultdict(float)
+        self.batch_size_buckets = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.batch_size_sum = 0
+        self.lag: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self._reported_at = time.monotonic()
+        self._reported_messages: dict[str, int] = {}
+
+    def observe_messages(self, topic: str, count: int):
+        with self._lock:
+            self.messages[topic] += count
+
+    def observe_batch(
+        self, topic: str, size: int, parse_seconds: float, insert_seconds: float
+    ):
+        with self._lock:
+            self.batches[topic] += 1
+            self.parse_seconds[topic] += parse_seconds
+            self.insert_seconds[topic] += insert_seconds
+            self.batch_size_buckets[bisect_left(BATCH_SIZE_BUCKETS, size)] += 1
+            self.batch_size_sum += size
+
+    def update_lag(self, consumer):
+        """Lag of the committed offset behind the end of each assigned partition."""
+        partitions = list(consumer.assignment())
+        if not partitions:
+            return
+        end_offsets = consumer.end_offsets(partitions)
+        lag = {}
+        for partition in partitions:
+            committed = consumer.committed(partition) or 0
+            lag[partition.topic, partition.partition] = max(
+                end_offsets.get(partition, committed) - committed, 0
+            )
+        with self._lock:
+            self.lag = lag
+
+    def report(self, consumer):
+        now = time.monotonic()
+        elapsed = now - self._reported_at
+        if elapsed < self.interval:
+            return
+        try:
+            self.update_lag(consumer)
+        except Exception as e:
+            logger.error(f"Partition lag is unavailable: {e}")
+        with self._lock:
+            rates = {
+                topic: round(
+                    (count - self._reported_messages.get(topic, 0)) / elapsed, 2
+                )
+                for topic, count in self.messages.items()
+            }
+            self._reported_messages = dict(self.messages)
+            stats = {
+                "messages_per_sec": rates,
+                "batches": dict(self.batches),
+                "parse_seconds": dict(self.parse_seconds),
+                "insert_seconds": dict(self.insert_seconds),
+                "cache_hit_ratio": cache_hit_ratio(),
+                "dead_letters": dead_letters.rejected,
+                "lag": {
+                    f"{topic}:{part}": lag for (topic, part), lag in self.lag.items()
+                },
+            }
+        self._reported_at = now
+        logger.info(f"ETL stats {json.dumps(stats)}")
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, values in (
+                ("messages_total", self.messages),
+                ("batches_total", self.batches),
+                ("parse_seconds_total", self.parse_seconds),
+                ("insert_seconds_total", self.insert_seconds),
+            ):
+                lines += [
+                    f'ugc_etl_{name}{{topic="{topic}"}} {value}'
+                    for topic, value in values.items()
+                ]
+            cumulative = 0
+            for bound, count in zip(
+                (*BATCH_SIZE_BUCKETS, "+Inf"), self.batch_size_buckets
+            ):
+                cumulative += count
+                lines.append(f'ugc_etl_batch_size_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"ugc_etl_batch_size_sum {self.batch_size_sum}")
+            lines.append(f"ugc_etl_batch_size_count {cumulative}")
+            lines += [
+                f'ugc_etl_partition_lag{{topic="{topic}",partition="{part}"}} {lag}'
+                for (topic, part), lag in self.lag.items()
+            ]
+        lines.append(f"ugc_etl_enrichment_cache_hits_total {enrichment_cache.hits}")
+        lines.append(f"ugc_etl_enrichment_cache_misses_total {enrichment_cache.misses}")
+        lines.append(f"ugc_etl_dead_letters_total {dead_letters.rejected}")
+        return "\n".join(lines) + "\n"
+
+
+def cache_hit_ratio() -> float:
+    lookups = enrichment_cache.hits + enrichment_cache.misses
+    return round(enrichment_cache.hits / lookups, 4) if lookups else 0.0
+
+
+etl_metrics = ETLMetrics(settings.STATS_INTERVAL)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = etl_metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int):
+    """Serves ``etl_metrics`` at ``http://0.0.0.0:<port>/`` from a daemon thread."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
@@ -1,12 +1,87 @@
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import backoff
 import requests
+from core.config import ETLSettings
 from core.logger import get_logger
+from requests.adapters import HTTPAdapter
 
+settings = ETLSettings()
 logger = get_logger()
 
+session = requests.Session()
+session.mount(
+    "http://",
+    HTTPAdapter(pool_connections=2, pool_maxsize=settings.ENRICH_WORKERS),
+)
+lookup_executor = ThreadPoolExecutor(
+    max_workers=settings.ENRICH_WORKERS, thread_name_prefix="enrich"
+)
+
+
+class EnrichmentCache:
+    """Bounded LRU of other services' responses that expire after ``ttl`` seconds."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, id: str) -> dict | None:
+        key = (url, id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, url: str, id: str, data: dict):
+        key = (url, id)
+        with self._lock:
+            self._entries[key] = (data, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+enrichment_cache = EnrichmentCache(
+    settings.ENRICH_CACHE_SIZE, settings.ENRICH_CACHE_TTL
+)
+
 
 @backoff.on_exception(backoff.expo, Exception, raise_on_giveup=False, logger=logger)
 def get_data_other_service(url: str, id: uuid.UUID):
-    return requests.get(f"{url}{id}").json()
+    response = session.get(f"{url}{id}", timeout=settings.ENRICH_TIMEOUT)
+    if response.status_code >= 500:
+        response.raise_for_status()
+    return response.json() if response.ok else {}
+
+
+def get_many_other_service(url: str, ids) -> dict[str, dict]:
+    """Looks up every distinct id once, fetching the uncached ones concurrently."""
+    found = {}
+    missing = []
+    for id in {str(id) for id in ids if id}:
+        data = enrichment_cache.get(url, id)
+        if data is None:
+            missing.append(id)
+        else:
+            found[id] = data
+    fetched = lookup_executor.map(lambda id: get_data_other_service(url, id), missing)
+    for id, data in zip(missing, fetched):
+        if data is not None:
+            enrichment_cache.set(url, id, data)
+            found[id] = data
+    return found
@@ -1,9 +1,6 @@
-python ./create_schema.py
+python ./migrate.py
 
-python ./ETL.py bookmarks &
-python ./ETL.py clicks &
-python ./ETL.py comments &
-python ./ETL.py likes &
-python ./ETL.py movie_filter_requests &
-python ./ETL.py movie_player_changes_topic &
-python ./ETL.py movie_watch_times
\ No newline at end of file
+# Partitions the ETL_GROUP_ID group has no offsets for start where the former
+# per-topic groups (named after their topic) stopped, or at the beginning of
+# the topic; stop the per-topic consumers before the first start.
+python ./ETL.py
@@ -0,0 +1,7 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+os.environ.setdefault("ETL_LOGGER_PATH", os.devnull)
@@ -0,0 +1,146 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from clickhouse_driver.errors import ServerException
+from db import click
+from db.click import ClickDB
+from service.dead_letter import DeadLetters
+
+TYPE_MISMATCH = 53
+MEMORY_LIMIT_EXCEEDED = 241
+
+
+class FakeClient:
+    """Inserts the columnar blocks it gets unless they hold a poison row."""
+
+    # uuid, then the user columns of the clicks table
+    resource_column = 5
+
+    def __init__(self, poison: str | None = None, error: ServerException | None = None):
+        self.poison = poison
+        self.error = error
+        self.blocks = []
+        self.inserted = []
+
+    def execute(self, query, data=None, columnar=False):
+        rows = list(zip(*data))
+        self.blocks.append(rows)
+        if self.error is not None:
+            raise self.error
+        if any(row[self.resource_column] == self.poison for row in rows):
+            raise ServerException(f"Cannot parse {self.poison}", code=TYPE_MISMATCH)
+        self.inserted.extend(rows)
+        return []
+
+
+class FakePool:
+    def __init__(self, client: FakeClient):
+        self.client = client
+
+    @contextmanager
+    def connection(self):
+        yield self.client
+
+
+def make_events(count: int) -> list[dict]:
+    return [
+        {"user_id": str(uuid.uuid4()), "resource": f"/films/{number}"}
+        for number in range(count)
+    ]
+
+
+@pytest.fixture
+def dead_letters(tmp_path):
+    return DeadLetters("", str(tmp_path / "dead_letters.jsonl"), timeout=1)
+
+
+def use_client(monkeypatch, client: FakeClient):
+    monkeypatch.setattr(click, "click_pool", FakePool(client))
+
+
+def test_poison_row_goes_to_dead_letters(monkeypatch, dead_letters, tmp_path):
+    events = make_events(7)
+    client = FakeClient(poison=events[4]["resource"])
+    use_client(monkeypatch, client)
+
+    assert ClickDB().insert("clicks", events, dead_letters.send)
+
+    resources = [row[FakeClient.resource_column] for row in client.inserted]
+    assert sorted(resources) == sorted(
+        event["resource"] for event in events if event is not events[4]
+    )
+    assert len(resources) == len(set(resources))
+    assert dead_letters.rejected == 1
+    assert dead_letters.flush()
+    stored = (tmp_path / "dead_letters.jsonl").read_text()
+    assert events[4]["resource"] in stored
+    assert stored.count("\n") == 1
+
+
+def test_unconvertible_event_is_rejected_before_the_insert(monkeypatch, dead_letters):
+    events = make_events(3)
+    events[1]["user_id"] = "not a uuid"
+    client = FakeClient()
+    use_client(monkeypatch, client)
+
+    assert ClickDB().insert("clicks", events, dead_letters.send)
+
+    assert len(client.blocks) == 1
+    assert len(client.inserted) == 2
+    assert dead_letters.rejected == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ServerException("Memory limit exceeded", code=MEMORY_LIMIT_EXCEEDED),
+        ServerException("Too many parts in partition", code=click.TOO_MANY_PARTS),
+    ],
+)
+def test_retryable_server_error_fails_the_batch(monkeypatch, dead_letters, error):
+    client = FakeClient(error=error)
+    use_client(monkeypatch, client)
+
+    assert not ClickDB().insert("clicks", make_events(8), dead_letters.send)
+
+    assert len(client.blocks) == 1
+    assert dead_letters.rejected == 0
+
+
+def test_too_many_partitions_is_bisected(monkeypatch, dead_letters):
+    events = make_events(4)
+    client = FakeClient()
+    use_client(monkeypatch, client)
+    error = ServerException(
+        "Too many partitions for single INSERT block", code=click.TOO_MANY_PARTS
+    )
+    execute = client.execute
+
+    def reject_big_blocks(query, data=None, columnar=False):
+        if len(data[0]) > 2:
+            client.blocks.append(list(zip(*data)))
+            raise error
+        return execute(query, data, columnar)
+
+    monkeypatch.setattr(client, "execute", reject_big_blocks)
+
+    assert ClickDB().insert("clicks", events, dead_letters.send)
+
+    assert [len(block) for block in client.blocks] == [4, 2, 2]
+    assert len(client.inserted) == 4
+    assert dead_letters.rejected == 0
+
+
+@pytest.mark.parametrize(
+    "code, message, rows, expected",
+    [
+        (MEMORY_LIMIT_EXCEEDED, "Memory limit", 100, True),
+        (TYPE_MISMATCH, "Cannot parse", 100, False),
+        (click.TOO_MANY_PARTS, "Too many parts", 100, True),
+        (click.TOO_MANY_PARTS, "Too many partitions", 100, False),
+        (click.TOO_MANY_PARTS, "Too many partitions", 1, True),
+    ],
+)
+def test_retryable(code, message, rows, expected):
+    assert click.retryable(ServerException(message, code=code), rows) is expected
@@ -0,0 +1,26 @@
+import msgpack
+import orjson
+import pytest
+from db.serializers import FORMAT_HEADER, get_format, loads
+
+EVENT = {"user_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "score": 5}
+
+
+@pytest.mark.parametrize(
+    "headers", [None, [], [("other", b"msgpack.v1")], [(FORMAT_HEADER, None)]]
+)
+def test_missing_format_is_json(headers):
+    assert get_format(headers) == "json.v1"
+    assert loads(orjson.dumps(EVENT), headers) == EVENT
+
+
+def test_msgpack_format():
+    headers = [(FORMAT_HEADER, b"msgpack.v1")]
+
+    assert loads(msgpack.packb(EVENT), headers) == EVENT
+
+
+@pytest.mark.parametrize("value", [b"avro.v1", b"\xff"])
+def test_unsupported_format_is_a_value_error(value):
+    with pytest.raises(ValueError):
+        loads(orjson.dumps(EVENT), [(FORMAT_HEADER, value)])
@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+# required by app.core.config, the unit tests never connect to Kafka
+for topic in (
+    "likes",
+    "comments",
+    "clicks",
+    "bookmarks",
+    "movie_filter_requests",
+    "movie_player_changes",
+    "movie_watch_times",
+):
+    os.environ.setdefault(f"KAFKA_{topic.upper()}_TOPIC", topic)
+os.environ.setdefault("KAFKA_BOOTSTRAP_SERVERS", "localhost:9094")
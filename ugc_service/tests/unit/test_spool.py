@@ -0,0 +1,143 @@
+import os
+import threading
+
+import pytest
+
+from app.services.spool import (
+    EventSpool,
+    SpooledRecord,
+    SpoolDrainer,
+    decode_records,
+    encode_record,
+)
+
+RECORDS = [
+    SpooledRecord("likes", b'{"score": 1}', b"user-1", [("ugc-format", b"json.v1")]),
+    SpooledRecord("clicks", b"\x81\xa3url\xa1/", None, []),
+    SpooledRecord("comments", b"", b"user-2", [("a", b""), ("b", b"\x00\xff")]),
+]
+
+
+def make_spool(path, segment_bytes=1024**2, max_bytes=1024**3) -> EventSpool:
+    return EventSpool(
+        str(path), max_bytes=max_bytes, segment_bytes=segment_bytes, fsync_interval=0
+    )
+
+
+def read_all(spool: EventSpool, chunk_size: int = 100) -> list[SpooledRecord]:
+    return [
+        record
+        for segment in sorted(spool._segments)
+        for chunk in spool.read_segment(segment, chunk_size)
+        for record in chunk
+    ]
+
+
+def test_codec_round_trip():
+    data = b"".join(encode_record(record) for record in RECORDS)
+
+    assert decode_records(data) == RECORDS
+
+
+@pytest.mark.parametrize("cut", [1, 5, 12])
+def test_truncated_record_ends_the_segment(cut):
+    data = b"".join(encode_record(record) for record in RECORDS)
+
+    assert decode_records(data[:-cut]) == RECORDS[:-1]
+
+
+def test_spool_round_trip_in_chunks(tmp_path):
+    spool = make_spool(tmp_path)
+    records = RECORDS * 5
+    for record in records:
+        assert spool.append(record)
+    segment = spool.oldest_segment()
+
+    chunks = list(spool.read_segment(segment, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 3]
+    assert [record for chunk in chunks for record in chunk] == records
+
+
+def test_spool_skips_the_record_truncated_by_a_crash(tmp_path):
+    spool = make_spool(tmp_path)
+    for record in RECORDS:
+        spool.append(record)
+    segment = spool.oldest_segment()
+    with open(segment, "r+b") as segment_file:
+        segment_file.truncate(os.path.getsize(segment) - 3)
+
+    assert read_all(spool) == RECORDS[:-1]
+
+
+def test_segments_rotate_at_segment_bytes(tmp_path):
+    record_size = len(encode_record(RECORDS[0]))
+    spool = make_spool(tmp_path, segment_bytes=record_size * 2)
+    for _ in range(5):
+        spool.append(RECORDS[0])
+
+    assert spool.stats()["spool_segments"] == 3
+    assert read_all(spool) == [RECORDS[0]] * 5
+
+
+def test_full_spool_drops_records(tmp_path):
+    record_size = len(encode_record(RECORDS[0]))
+    spool = make_spool(tmp_path, max_bytes=record_size * 2)
+
+    assert [spool.append(RECORDS[0]) for _ in range(3)] == [True, True, False]
+    assert spool.stats()["dropped_total"] == 1
+
+
+def test_workers_take_their_own_directory(tmp_path):
+    first = make_spool(tmp_path)
+    second = make_spool(tmp_path)
+    first.append(RECORDS[0])
+    first.close()
+
+    assert first.directory != second.directory
+    assert second.oldest_segment() is None
+
+    first._lock_file.close()
+    restarted = make_spool(tmp_path)
+
+    assert restarted.directory == first.directory
+    assert read_all(restarted) == [RECORDS[0]]
+
+
+def test_drainer_retries_a_failed_chunk_in_order(tmp_path):
+    spool = make_spool(tmp_path)
+    records = [
+        SpooledRecord("likes", str(number).encode(), None, []) for number in range(5)
+    ]
+    for record in records:
+        spool.append(record)
+    attempts = []
+    replayed = []
+    drained = threading.Event()
+
+    def replay(chunk):
+        attempts.append(chunk)
+        if len(attempts) in (2, 3):
+            return False
+        replayed.extend(chunk)
+        if len(replayed) == len(records):
+            drained.set()
+        return True
+
+    drainer = SpoolDrainer(
+        spool, replay, drain_rate=0, chunk_size=2, retry_interval=0.01
+    )
+    drainer.start()
+    try:
+        assert drained.wait(timeout=5)
+        while spool.stats()["spool_segments"]:
+            drained.wait(0.01)
+    finally:
+        drainer.stop()
+        drainer.join(timeout=5)
+
+    assert replayed == records
+    assert [len(chunk) for chunk in attempts] == [2, 2, 2, 2, 1]
+    assert attempts[1] == attempts[2] == attempts[3]
+    assert spool.stats()["drained_total"] == len(records)
+    assert os.listdir(spool.directory) == [".lock"]